@@ -11,14 +11,19 @@ import fr.nix.agribot.config.Plants
 import fr.nix.agribot.config.StatsConfig
 import fr.nix.agribot.gui.ConfigScreen
 import fr.nix.agribot.gui.StatsScreen
+import fr.nix.agribot.menu.MenuDetector
 import net.fabricmc.api.ClientModInitializer
 import net.fabricmc.fabric.api.client.screen.v1.ScreenEvents
 import net.fabricmc.fabric.api.client.screen.v1.Screens
 import net.minecraft.client.MinecraftClient
+import net.minecraft.client.gui.DrawContext
 import net.minecraft.client.gui.screen.multiplayer.MultiplayerScreen
 import net.minecraft.client.gui.widget.ButtonWidget
 import net.minecraft.text.Text
 import org.slf4j.LoggerFactory
+import java.time.Instant
+import java.time.LocalDateTime
+import java.time.ZoneId
 
 object AgriBotClient : ClientModInitializer {
     private val logger = LoggerFactory.getLogger("agribot")
@@ -36,6 +41,10 @@ object AgriBotClient : ClientModInitializer {
     private var lastStartupEndTime: Long = 0
     private var lastPreConnectionTimerActive: Boolean = false
 
+    // Heure de fin formatee "HH:MM": constante pendant tout un compte a rebours
+    private var endHourEpochMs: Long = -1
+    private var endHourText: String = ""
+
     override fun onInitializeClient() {
         logger.info("==================================================")
         logger.info("AgriBot - Initialisation du client")
@@ -50,6 +59,9 @@ object AgriBotClient : ClientModInitializer {
         // Initialiser le coeur du bot
         BotCore.init()
 
+        // Reveil des attentes de menu a l'ouverture des ecrans
+        MenuDetector.init()
+
         // Initialiser le gestionnaire de demarrage automatique
         AutoStartManager.init()
 
@@ -111,7 +123,7 @@ object AgriBotClient : ClientModInitializer {
      * Affiche le timer de session sur l'ecran multijoueur.
      * Optimise: ne recalcule le texte que toutes les secondes ou si l'etat change.
      */
-    private fun renderSessionTimer(context: net.minecraft.client.gui.DrawContext) {
+    private fun renderSessionTimer(context: DrawContext) {
         val client = MinecraftClient.getInstance()
         val currentTime = System.currentTimeMillis()
 
@@ -163,12 +175,7 @@ object AgriBotClient : ClientModInitializer {
         val hours = totalSeconds / 3600
         val minutes = (totalSeconds % 3600) / 60
         val seconds = totalSeconds % 60
-
-        val endTime = java.time.LocalDateTime.ofInstant(
-            java.time.Instant.ofEpochMilli(endEpochMs),
-            java.time.ZoneId.systemDefault()
-        )
-        val hourStr = String.format("%02d:%02d", endTime.hour, endTime.minute)
+        val hourStr = formatEndHour(endEpochMs)
 
         val timeStr = when {
             hours > 0 -> "${hours}h ${minutes.toString().padStart(2, '0')}m ${seconds.toString().padStart(2, '0')}s"
@@ -178,6 +185,22 @@ object AgriBotClient : ClientModInitializer {
         return "$timeStr ($hourStr)"
     }
 
+    /**
+     * Formate l'heure de fin d'un compte a rebours (HH:MM).
+     * Seul le temps restant change chaque seconde: l'heure n'est reformatee que si la fin change.
+     */
+    private fun formatEndHour(endEpochMs: Long): String {
+        if (endEpochMs != endHourEpochMs) {
+            val endTime = LocalDateTime.ofInstant(
+                Instant.ofEpochMilli(endEpochMs),
+                ZoneId.systemDefault()
+            )
+            endHourText = String.format("%02d:%02d", endTime.hour, endTime.minute)
+            endHourEpochMs = endEpochMs
+        }
+        return endHourText
+    }
+
     /**
      * Met a jour le cache du timer.
      */
@@ -190,12 +213,7 @@ object AgriBotClient : ClientModInitializer {
             val preConnText = PreConnectionTimer.formatRemainingTime()
             val preConnEndTime = PreConnectionTimer.getEndTime()
             if (preConnEndTime > 0) {
-                val endHour = java.time.LocalDateTime.ofInstant(
-                    java.time.Instant.ofEpochMilli(preConnEndTime),
-                    java.time.ZoneId.systemDefault()
-                )
-                val hourStr = String.format("%02d:%02d", endHour.hour, endHour.minute)
-                cachedTimerText = "$preConnText ($hourStr)"
+                cachedTimerText = "$preConnText (${formatEndHour(preConnEndTime)})"
             } else {
                 cachedTimerText = preConnText
             }
@@ -3,7 +3,9 @@ package fr.nix.agribot.action
 import fr.nix.agribot.menu.MenuDetector
 import net.fabricmc.fabric.api.client.keybinding.v1.KeyBindingHelper
 import net.minecraft.client.MinecraftClient
+import net.minecraft.client.gui.screen.ingame.HandledScreen
 import net.minecraft.client.option.KeyBinding
+import net.minecraft.screen.slot.SlotActionType
 import net.minecraft.util.ActionResult
 import net.minecraft.util.Hand
 import net.minecraft.util.PlayerInput
@@ -43,8 +45,9 @@ object ActionManager {
      * Simule un clic droit (utiliser/interagir) comme un humain.
      * Utilise la vraie methode doItemUse() de Minecraft via reflexion.
      * Optimise: la methode est cachee au premier appel (lazy).
+     * @param swing Anime aussi le bras dans la meme tache client (evite un second client.execute)
      */
-    fun rightClick() {
+    fun rightClick(swing: Boolean = false) {
         client.execute {
             val method = doItemUseMethod
             if (method != null) {
@@ -58,6 +61,10 @@ object ActionManager {
             } else {
                 rightClickFallback()
             }
+
+            if (swing) {
+                client.player?.swingHand(Hand.MAIN_HAND)
+            }
         }
     }
 
@@ -157,33 +164,53 @@ object ActionManager {
      */
     fun startSneaking() {
         client.execute {
-            val options = client.options
-            val player = client.player
+            applyStartSneaking()
+        }
+    }
 
-            // Forcer l'etat de sneak via PlayerInput (1.21.4+)
-            player?.let { p ->
-                val currentInput = p.input.playerInput
-                val newInput = PlayerInput(
-                    currentInput.forward,
-                    currentInput.backward,
-                    currentInput.left,
-                    currentInput.right,
-                    currentInput.jump,
-                    true,  // sneak = true
-                    currentInput.sprint
-                )
-                p.input.playerInput = newInput
-            }
+    /**
+     * Ferme le menu ouvert puis s'accroupit, dans une seule tache sur le thread client
+     * (au lieu de deux taches separees par une pause).
+     * Thread-safe: peut etre appele depuis n'importe quel thread.
+     */
+    fun pressEscapeAndStartSneaking() {
+        client.execute {
+            client.player?.closeHandledScreen()
+            logger.debug("Touche Escape")
+            applyStartSneaking()
+        }
+    }
 
-            // Forcer l'etat de sneak directement sur le joueur
-            player?.setSneaking(true)
+    /**
+     * Active l'accroupissement. Doit etre appele sur le thread client.
+     */
+    private fun applyStartSneaking() {
+        val options = client.options
+        val player = client.player
+
+        // Forcer l'etat de sneak via PlayerInput (1.21.4+)
+        player?.let { p ->
+            val currentInput = p.input.playerInput
+            val newInput = PlayerInput(
+                currentInput.forward,
+                currentInput.backward,
+                currentInput.left,
+                currentInput.right,
+                currentInput.jump,
+                true,  // sneak = true
+                currentInput.sprint
+            )
+            p.input.playerInput = newInput
+        }
 
-            // Activer la touche sneak (utilise boundKey pour respecter la configuration utilisateur)
-            KeyBinding.setKeyPressed(KeyBindingHelper.getBoundKeyOf(options.sneakKey), true)
-            sneakKeyHeld = true
+        // Forcer l'etat de sneak directement sur le joueur
+        player?.setSneaking(true)
 
-            logger.debug("Debut accroupissement - isSneaking: ${player?.isSneaking}, playerInput.sneak: ${player?.input?.playerInput?.sneak}")
-        }
+        // Activer la touche sneak (utilise boundKey pour respecter la configuration utilisateur)
+        KeyBinding.setKeyPressed(KeyBindingHelper.getBoundKeyOf(options.sneakKey), true)
+        sneakKeyHeld = true
+
+        logger.debug("Debut accroupissement - isSneaking: ${player?.isSneaking}, playerInput.sneak: ${player?.input?.playerInput?.sneak}")
     }
 
     /**
@@ -440,7 +467,7 @@ object ActionManager {
      */
     fun isInInventoryScreen(): Boolean {
         val screen = client.currentScreen ?: return false
-        return screen is net.minecraft.client.gui.screen.ingame.HandledScreen<*>
+        return screen is HandledScreen<*>
     }
 
     /**
@@ -522,8 +549,8 @@ object ActionManager {
             val player = client.player ?: return@execute
             val hitResult = client.crosshairTarget
 
-            if (hitResult != null && hitResult.type == net.minecraft.util.hit.HitResult.Type.BLOCK) {
-                val blockHitResult = hitResult as net.minecraft.util.hit.BlockHitResult
+            if (hitResult != null && hitResult.type == HitResult.Type.BLOCK) {
+                val blockHitResult = hitResult as BlockHitResult
                 interactionManager.interactBlock(player, Hand.MAIN_HAND, blockHitResult)
                 logger.debug("Interaction avec bloc")
             }
@@ -540,8 +567,8 @@ object ActionManager {
             val player = client.player ?: return@execute
             val hitResult = client.crosshairTarget
 
-            if (hitResult != null && hitResult.type == net.minecraft.util.hit.HitResult.Type.BLOCK) {
-                val blockHitResult = hitResult as net.minecraft.util.hit.BlockHitResult
+            if (hitResult != null && hitResult.type == HitResult.Type.BLOCK) {
+                val blockHitResult = hitResult as BlockHitResult
                 interactionManager.attackBlock(blockHitResult.blockPos, blockHitResult.side)
                 logger.debug("Attaque bloc")
             }
@@ -558,7 +585,7 @@ object ActionManager {
     fun clickSlot(slotIndex: Int, button: Int = 1) {
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour cliquer sur le slot")
                 return@execute
             }
@@ -579,7 +606,7 @@ object ActionManager {
                 handler.syncId,
                 slotIndex,
                 button,
-                net.minecraft.screen.slot.SlotActionType.PICKUP,
+                SlotActionType.PICKUP,
                 player
             )
             logger.debug("Clic slot $slotIndex avec bouton $button")
@@ -611,7 +638,7 @@ object ActionManager {
     fun shiftClickSlot(slotIndex: Int) {
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour shift+cliquer sur le slot")
                 return@execute
             }
@@ -631,7 +658,7 @@ object ActionManager {
                 handler.syncId,
                 slotIndex,
                 0,  // bouton gauche
-                net.minecraft.screen.slot.SlotActionType.QUICK_MOVE,
+                SlotActionType.QUICK_MOVE,
                 player
             )
             logger.debug("Shift+clic slot $slotIndex")
@@ -648,7 +675,7 @@ object ActionManager {
     fun pickAndPlaceSlot(sourceSlot: Int, destinationSlot: Int) {
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour pick and place")
                 return@execute
             }
@@ -672,7 +699,7 @@ object ActionManager {
                 handler.syncId,
                 sourceSlot,
                 0,  // bouton gauche
-                net.minecraft.screen.slot.SlotActionType.PICKUP,
+                SlotActionType.PICKUP,
                 player
             )
             logger.debug("Pick item du slot $sourceSlot")
@@ -682,7 +709,7 @@ object ActionManager {
                 handler.syncId,
                 destinationSlot,
                 0,  // bouton gauche
-                net.minecraft.screen.slot.SlotActionType.PICKUP,
+                SlotActionType.PICKUP,
                 player
             )
             logger.debug("Place item dans slot $destinationSlot")
@@ -69,6 +69,12 @@ object BotConstants {
     /** Limite de seaux utilises par station (securite) */
     const val MAX_BUCKETS_PER_STATION = 50
 
+    /** Delai entre chaque seau lors du vidage des seaux restants (ms) */
+    const val EMPTY_BUCKET_DELAY_MS = 4000
+
+    /** Delai entre chaque seau lors du vidage rapide (option fastBucketEmptying) (ms) */
+    const val FAST_EMPTY_BUCKET_DELAY_MS = 1000
+
     // ==================== CONNEXION ====================
 
     /** Delai entre les tentatives de connexion (ticks) - 30 secondes */
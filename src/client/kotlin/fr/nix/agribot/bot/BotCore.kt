@@ -3,6 +3,7 @@ package fr.nix.agribot.bot
 import fr.nix.agribot.AgriBotClient
 import fr.nix.agribot.action.ActionManager
 import fr.nix.agribot.bucket.BucketManager
+import fr.nix.agribot.bucket.BucketMode
 import fr.nix.agribot.chat.ChatListener
 import fr.nix.agribot.chat.ChatManager
 import fr.nix.agribot.config.AgriConfig
@@ -15,6 +16,7 @@ import net.minecraft.client.gui.screen.DisconnectedScreen
 import net.minecraft.client.gui.screen.TitleScreen
 import net.minecraft.client.gui.screen.multiplayer.MultiplayerScreen
 import org.slf4j.LoggerFactory
+import java.util.concurrent.TimeUnit
 
 /**
  * Coeur du bot - gere le cycle de farming.
@@ -33,6 +35,8 @@ object BotCore {
     // Utilisation des constantes centralisees (voir BotConstants.kt)
     private var tickCounter = 0
     private var waitTicks = 0
+    // Condition de reveil anticipe pendant une attente (null = attente fixe)
+    private var waitWakeCondition: (() -> Boolean)? = null
 
     // Sous-etats pour la gestion des seaux dans le coffre
     private var bucketManagementStep = 0
@@ -53,7 +57,7 @@ object BotCore {
     private var refillingCheckCount = 0
 
     // Sous-etats pour l'attente de teleportation (non-bloquant)
-    private var teleportWaitRetries = 0
+    private var teleportWaitStartNanos = 0L  // 0 = attente pas encore commencee (System.nanoTime)
 
     // Sous-etats pour l'ouverture des menus (non-bloquant)
     private var menuOpenStep = 0
@@ -209,7 +213,7 @@ object BotCore {
             // Remettre le delai a 0 pour les prochaines sessions
             config.startupDelayMinutes = 0
             config.save()
-            waitMs(delaySeconds * 1000)
+            waitUntilTime(stateData.startupEndTime)
             return
         }
 
@@ -269,7 +273,7 @@ object BotCore {
             ServerConnector.disconnectAndPrepareReconnect()
             stateData.pauseEndTime = System.currentTimeMillis() + (waitTimeSeconds * 1000L)
             stateData.state = BotState.PAUSED
-            waitMs(waitTimeSeconds * 1000)
+            waitUntilTime(stateData.pauseEndTime)
             return
         }
 
@@ -347,8 +351,8 @@ object BotCore {
         val needsTransition = BucketManager.needsModeTransition()
         val currentMode = BucketManager.getCurrentMode()
         val isRetrieveTransition = needsTransition &&
-            (currentMode == fr.nix.agribot.bucket.BucketMode.RETRIEVE ||
-             currentMode == fr.nix.agribot.bucket.BucketMode.NORMAL)
+            (currentMode == BucketMode.RETRIEVE ||
+             currentMode == BucketMode.NORMAL)
 
         if (missingBuckets > 0 && config.homeBackup.isNotBlank() && !isRetrieveTransition) {
             // Seaux manquants ET ce n'est PAS une transition matin->jour
@@ -364,21 +368,7 @@ object BotCore {
             ChatManager.showActionBar("$missingBuckets seaux manquants - Recuperation...", "e")
 
             // Preparer les donnees de session avant la recuperation
-            stateData.apply {
-                cachedStations = stations
-                currentStationIndex = 0
-                totalStations = stations.size
-                sessionStartTime = System.currentTimeMillis()
-                stationsCompleted = 0
-                needsWaterRefill = needsWater
-                this.isWaterOnlySession = isWaterOnly
-                waterRefillsRemaining = refillsNeeded
-                cycleStartTime = cycleStart
-                isFirstStationOfSession = true
-                consecutiveStationsWithoutMelon = 0  // Reset du compteur de validation recolte
-                isEarlyDisconnectDueToNoMelon = false
-                melonFoundThisSession = false
-            }
+            initSessionData(stations, needsWater, isWaterOnly, refillsNeeded, cycleStart)
 
             // Configurer la recuperation de seaux
             bucketRecoveryStep = 0
@@ -401,21 +391,7 @@ object BotCore {
             ChatManager.showActionBar("BUG: $excessBuckets seaux en trop - Depot backup...", "c")
 
             // Preparer les donnees de session avant le depot
-            stateData.apply {
-                cachedStations = stations
-                currentStationIndex = 0
-                totalStations = stations.size
-                sessionStartTime = System.currentTimeMillis()
-                stationsCompleted = 0
-                needsWaterRefill = needsWater
-                this.isWaterOnlySession = isWaterOnly
-                waterRefillsRemaining = refillsNeeded
-                cycleStartTime = cycleStart
-                isFirstStationOfSession = true
-                consecutiveStationsWithoutMelon = 0
-                isEarlyDisconnectDueToNoMelon = false
-                melonFoundThisSession = false
-            }
+            initSessionData(stations, needsWater, isWaterOnly, refillsNeeded, cycleStart)
 
             // Configurer le depot de seaux excedentaires
             bucketRecoveryStep = 0
@@ -432,28 +408,15 @@ object BotCore {
             logger.info("Transition matin->jour detectee - recuperation depuis coffre HOME (pas BACKUP)")
         }
 
-        stateData.apply {
-            state = BotState.MANAGING_BUCKETS
-            currentStationIndex = 0
-            totalStations = stations.size
-            sessionStartTime = System.currentTimeMillis()
-            stationsCompleted = 0
-            needsWaterRefill = needsWater
-            this.isWaterOnlySession = isWaterOnly
-            waterRefillsRemaining = refillsNeeded
-            cycleStartTime = cycleStart
-            isFirstStationOfSession = true  // Reinitialiser pour chaque nouvelle session
-            consecutiveStationsWithoutMelon = 0  // Reset du compteur de validation recolte
-            isEarlyDisconnectDueToNoMelon = false
-            melonFoundThisSession = false  // Reset pour cette session
-        }
+        initSessionData(stations, needsWater, isWaterOnly, refillsNeeded, cycleStart)
 
         val sessionType = if (isWaterOnly) "Remplissage eau" else "Session farming"
         ChatManager.showActionBar("$sessionType - ${stations.size} stations", "a")
         ChatListener.resetAllDetections()
 
         // Verifier si on doit gerer les seaux (transition matin/apres-midi)
-        if (BucketManager.needsModeTransition()) {
+        // needsTransition deja calcule plus haut: evite un second comptage de l'inventaire
+        if (needsTransition) {
             bucketManagementStep = 0
             stateData.state = BotState.MANAGING_BUCKETS
         } else {
@@ -462,6 +425,34 @@ object BotCore {
         }
     }
 
+    /**
+     * Initialise les donnees d'une nouvelle session (premiere station, compteurs remis a zero).
+     * Partage par les trois chemins de startFarmingSession (recuperation, depot, session normale).
+     */
+    private fun initSessionData(
+        stations: List<String>,
+        needsWater: Boolean,
+        isWaterOnly: Boolean,
+        refillsNeeded: Int,
+        cycleStart: Long
+    ) {
+        stateData.apply {
+            cachedStations = stations
+            currentStationIndex = 0
+            totalStations = stations.size
+            sessionStartTime = System.currentTimeMillis()
+            stationsCompleted = 0
+            needsWaterRefill = needsWater
+            isWaterOnlySession = isWaterOnly
+            waterRefillsRemaining = refillsNeeded
+            cycleStartTime = cycleStart
+            isFirstStationOfSession = true
+            consecutiveStationsWithoutMelon = 0  // Reset du compteur de validation recolte
+            isEarlyDisconnectDueToNoMelon = false
+            melonFoundThisSession = false
+        }
+    }
+
     /**
      * Reprend la session de farming apres une deconnexion inattendue (crash).
      * Contrairement a startFarmingSession(), cette fonction ne reinitialise PAS currentStationIndex.
@@ -477,12 +468,7 @@ object BotCore {
             return
         }
 
-        val stations = stateData.cachedStations
-        val currentStation = if (stateData.currentStationIndex < stations.size) {
-            stations[stateData.currentStationIndex]
-        } else {
-            "N/A"
-        }
+        val currentStation = stateData.currentStationName() ?: "N/A"
 
         logger.info("========================================")
         logger.info("REPRISE DE SESSION APRES CRASH")
@@ -518,8 +504,8 @@ object BotCore {
         val needsTransition = BucketManager.needsModeTransition()
         val currentMode = BucketManager.getCurrentMode()
         val isRetrieveTransition = needsTransition &&
-            (currentMode == fr.nix.agribot.bucket.BucketMode.RETRIEVE ||
-             currentMode == fr.nix.agribot.bucket.BucketMode.NORMAL)
+            (currentMode == BucketMode.RETRIEVE ||
+             currentMode == BucketMode.NORMAL)
 
         if (missingBuckets > 0 && config.homeBackup.isNotBlank() && !isRetrieveTransition) {
             // Seaux manquants ET ce n'est PAS une transition matin->jour
@@ -580,7 +566,7 @@ object BotCore {
         ChatManager.showActionBar("$sessionType - $stationsRestantes stations restantes", "a")
 
         // Verifier si on doit gerer les seaux (transition matin/apres-midi)
-        if (BucketManager.needsModeTransition()) {
+        if (needsTransition) {
             bucketManagementStep = 0
             stateData.state = BotState.MANAGING_BUCKETS
         } else {
@@ -595,6 +581,10 @@ object BotCore {
     fun stop() {
         logger.info("Arret du bot")
         ActionManager.releaseAllKeys()
+        // Abandonner l'attente en cours: sinon un redemarrage apres un arret pendant une
+        // pause (jusqu'a 2h pour un event) resterait bloque jusqu'a la fin de l'ancienne attente
+        waitTicks = 0
+        waitWakeCondition = null
         stateData.state = BotState.IDLE
         config.botEnabled = false
         ChatManager.showActionBar("Bot arrete", "c")
@@ -611,9 +601,15 @@ object BotCore {
         disconnectionHandledThisTick = false
 
         // OPTIMISATION: Early return si en attente (evite toutes les verifications)
+        // sauf si la condition de reveil est deja remplie (evenement recu avant la fin du delai)
         if (waitTicks > 0) {
-            waitTicks--
-            return
+            val wakeCondition = waitWakeCondition
+            if (wakeCondition == null || !wakeCondition()) {
+                waitTicks--
+                return
+            }
+            waitTicks = 0
+            waitWakeCondition = null
         }
 
         // Verification periodique de la connexion (sauf si en pause, deconnexion ou idle)
@@ -698,9 +694,29 @@ object BotCore {
      */
     private fun wait(ticks: Int) {
         waitTicks = ticks
+        waitWakeCondition = null
         stateData.lastActionTime = System.currentTimeMillis()
     }
 
+    /**
+     * Attend au maximum un certain nombre de ticks, mais reprend des que la condition est vraie.
+     * La condition est evaluee a chaque tick pendant l'attente.
+     */
+    private fun waitUntil(maxTicks: Int, condition: () -> Boolean) {
+        wait(maxTicks)
+        waitWakeCondition = condition
+    }
+
+    /**
+     * Attend jusqu'a un timestamp donne (fin de pause, fin du delai de demarrage).
+     * La fin est calee sur l'horloge murale: si les ticks ralentissent (lag, jeu en arriere-plan),
+     * la pause se termine quand meme a l'heure affichee par le compte a rebours.
+     */
+    private fun waitUntilTime(endTimeMs: Long) {
+        val remainingMs = (endTimeMs - System.currentTimeMillis()).coerceIn(0L, Int.MAX_VALUE.toLong()).toInt()
+        waitUntil(BotConstants.msToTicks(remainingMs)) { System.currentTimeMillis() >= endTimeMs }
+    }
+
     /**
      * Attend un certain nombre de millisecondes.
      */
@@ -861,7 +877,7 @@ object BotCore {
 
         // Passer en pause
         stateData.state = BotState.PAUSED
-        waitMs(AgriConfig.EVENT_PAUSE_SECONDS * 1000)
+        waitUntilTime(stateData.pauseEndTime)
     }
 
     /**
@@ -870,12 +886,7 @@ object BotCore {
      */
     private fun handleUnexpectedDisconnection() {
         val currentState = stateData.state
-        val stations = stateData.cachedStations
-        val currentStation = if (stateData.currentStationIndex < stations.size) {
-            stations[stateData.currentStationIndex]
-        } else {
-            "N/A"
-        }
+        val currentStation = stateData.currentStationName() ?: "N/A"
 
         logger.warn("========================================")
         logger.warn("DECONNEXION INATTENDUE DETECTEE")
@@ -909,7 +920,7 @@ object BotCore {
 
         // Passer en pause
         stateData.state = BotState.PAUSED
-        waitMs(AgriConfig.CRASH_RECONNECT_DELAY_SECONDS * 1000)
+        waitUntilTime(stateData.pauseEndTime)
     }
 
     /**
@@ -919,12 +930,7 @@ object BotCore {
      */
     private fun handleHubTransferDetected() {
         val currentState = stateData.state
-        val stations = stateData.cachedStations
-        val currentStation = if (stateData.currentStationIndex < stations.size) {
-            stations[stateData.currentStationIndex]
-        } else {
-            "N/A"
-        }
+        val currentStation = stateData.currentStationName() ?: "N/A"
 
         logger.warn("========================================")
         logger.warn("TRANSFERT VERS LE HUB DETECTE")
@@ -1195,7 +1201,7 @@ object BotCore {
             2 -> {
                 // Etape 2: Preparer le depot/recuperation selon le mode
                 when (mode) {
-                    fr.nix.agribot.bucket.BucketMode.MORNING -> {
+                    BucketMode.MORNING -> {
                         val toKeep = BucketManager.getBucketsToKeep()
                         val currentBuckets = InventoryManager.countBucketsInPlayerInventoryInChestMenu()
                         if (currentBuckets > toKeep) {
@@ -1228,7 +1234,7 @@ object BotCore {
                             bucketManagementStep = 5
                         }
                     }
-                    fr.nix.agribot.bucket.BucketMode.RETRIEVE, fr.nix.agribot.bucket.BucketMode.NORMAL -> {
+                    BucketMode.RETRIEVE, BucketMode.NORMAL -> {
                         logger.info("Recuperation des seaux du coffre")
                         bucketSlotsToProcess = InventoryManager.findBucketSlotsInChest()
                         bucketSlotIndex = 0
@@ -1290,7 +1296,7 @@ object BotCore {
                 waitMs(500)
 
                 // Verifier si on est en mode recuperation (RETRIEVE/NORMAL) et si on a assez de seaux
-                if (mode == fr.nix.agribot.bucket.BucketMode.RETRIEVE || mode == fr.nix.agribot.bucket.BucketMode.NORMAL) {
+                if (mode == BucketMode.RETRIEVE || mode == BucketMode.NORMAL) {
                     BucketManager.refreshState()
                     val currentBuckets = BucketManager.state.totalBuckets
                     val targetBuckets = config.targetBucketCount
@@ -1381,7 +1387,7 @@ object BotCore {
         // Teleportation - reset la detection AVANT d'envoyer la commande
         // pour eviter toute race condition avec la reponse du serveur
         ChatListener.resetTeleportDetection()
-        teleportWaitRetries = 0  // Reset le compteur d'attente de teleportation
+        teleportWaitStartNanos = 0L  // Reset l'attente de confirmation de teleportation
         ChatManager.teleportToHome(stationName)
 
         stateData.state = BotState.WAITING_TELEPORT
@@ -1390,22 +1396,31 @@ object BotCore {
 
     private fun handleWaitingTeleport() {
         // Attendre que la teleportation soit confirmee par le serveur
-        val maxRetries = config.getTeleportTimeoutRetries()
         if (!ChatListener.teleportDetected) {
-            teleportWaitRetries++
-            if (teleportWaitRetries >= maxRetries) {
-                // Timeout - continuer quand meme avec un warning
-                logger.warn("Timeout attente confirmation teleportation (${teleportWaitRetries * BotConstants.TELEPORT_CHECK_INTERVAL_MS}ms) - poursuite sans confirmation")
-            } else {
-                // Attendre encore un peu
-                if (teleportWaitRetries == 1) {
-                    logger.debug("En attente de confirmation de teleportation...")
+            if (teleportWaitStartNanos == 0L) {
+                // Une seule attente jusqu'au timeout, reveillee des que le message de
+                // teleportation arrive (ou qu'une teleportation forcee doit etre traitee)
+                // au lieu de re-verifier toutes les 100ms.
+                // La verification periodique de connexion est suspendue pendant l'attente:
+                // une deconnexion doit donc aussi la reveiller
+                teleportWaitStartNanos = System.nanoTime()
+                logger.debug("En attente de confirmation de teleportation...")
+                val timeoutMs = config.getTeleportTimeoutRetries() * BotConstants.TELEPORT_CHECK_INTERVAL_MS
+                waitUntil(BotConstants.msToTicks(timeoutMs)) {
+                    ChatListener.teleportDetected || ChatListener.forcedTeleportDetected || !ChatManager.isConnected()
                 }
-                waitMs(BotConstants.TELEPORT_CHECK_INTERVAL_MS)  // Verifier toutes les 100ms
                 return
             }
-        } else if (teleportWaitRetries > 0) {
-            logger.info("Teleportation confirmee apres ${teleportWaitRetries * BotConstants.TELEPORT_CHECK_INTERVAL_MS}ms d'attente")
+            if (!ChatManager.isConnected()) {
+                logger.warn("Deconnexion pendant l'attente de teleportation (${teleportWaitElapsedMs()}ms)")
+                teleportWaitStartNanos = 0L
+                handleUnexpectedDisconnection()
+                return
+            }
+            // Timeout - continuer quand meme avec un warning
+            logger.warn("Timeout attente confirmation teleportation (${teleportWaitElapsedMs()}ms) - poursuite sans confirmation")
+        } else if (teleportWaitStartNanos != 0L) {
+            logger.info("Teleportation confirmee apres ${teleportWaitElapsedMs()}ms d'attente")
         }
 
         // Teleportation confirmee (ou timeout) - calculer la distance pour ajuster le delai
@@ -1484,15 +1499,17 @@ object BotCore {
         waitMs(100 + extraDelay)
     }
 
+    /**
+     * Temps ecoule depuis le debut de l'attente de confirmation de teleportation (horloge monotone).
+     */
+    private fun teleportWaitElapsedMs(): Long {
+        return TimeUnit.NANOSECONDS.toMillis(System.nanoTime() - teleportWaitStartNanos)
+    }
+
     private fun handleOpeningStation() {
         // Ouverture de la station (non-bloquant)
         // OPTIMISATION: utiliser le cache au lieu de recalculer
-        val stations = stateData.cachedStations
-        val currentStation = if (stateData.currentStationIndex < stations.size) {
-            stations[stateData.currentStationIndex]
-        } else {
-            "Station ${stateData.currentStationIndex + 1}"
-        }
+        val currentStation = stateData.currentStationName() ?: "Station ${stateData.currentStationIndex + 1}"
 
         when (menuOpenStep) {
             0 -> {
@@ -1637,11 +1654,14 @@ object BotCore {
                 }
             }
             2 -> {
-                // Etape 3: Fermer le menu de station
-                ActionManager.pressEscape()
-                waitMs(300)
+                // Etape 3: Fermer le menu de station et s'accroupir dans la foulee
+                // (une seule attente de 300ms au lieu de 300ms apres Escape puis 300ms apres sneak)
+                logger.info("Plantation - fermeture station + debut sneak")
+                ActionManager.pressEscapeAndStartSneaking()
                 harvestingStep = 0  // Reset pour la prochaine station
+                plantingStep = 1  // Sneak deja demande: passer directement a la verification
                 stateData.state = BotState.PLANTING
+                waitMs(300)
             }
         }
     }
@@ -1747,12 +1767,8 @@ object BotCore {
             1 -> {
                 // Etape 1: Faire le clic droit et sauvegarder l'etat
                 waterBucketsBefore = InventoryManager.countWaterBucketsInHotbar()
-                ActionManager.rightClick()
-
-                // Ajouter l'animation du bras
-                MinecraftClient.getInstance().execute {
-                    MinecraftClient.getInstance().player?.swingHand(net.minecraft.util.Hand.MAIN_HAND)
-                }
+                // Clic droit + animation du bras dans une seule tache sur le thread client
+                ActionManager.rightClick(swing = true)
 
                 waterPouringCheckCount = 0
                 waterPouringStep = 2
@@ -1767,8 +1783,14 @@ object BotCore {
                     BucketManager.state.bucketsUsedThisStation++
                     logger.debug("Seau vide (${BucketManager.state.bucketsUsedThisStation} cette station)")
                     waterPouringStep = 0
-                    // Utiliser le delai adaptatif pour le prochain seau
-                    waitMs(BucketManager.getAdaptiveDelay().toInt())
+                    // Utiliser le delai adaptatif pour le prochain seau, interrompu si le
+                    // message "station pleine" arrive entre-temps
+                    waitUntil(BotConstants.msToTicks(BucketManager.getAdaptiveDelay().toInt())) {
+                        BucketManager.isStationFull()
+                    }
+                } else if (BucketManager.isStationFull()) {
+                    // Station pleine: le seau ne sera jamais consomme, inutile d'attendre le timeout
+                    waterPouringStep = 0
                 } else {
                     waterPouringCheckCount++
                     if (waterPouringCheckCount >= BotConstants.MAX_WATER_POURING_CHECKS) {
@@ -1922,7 +1944,8 @@ object BotCore {
             if (BucketManager.selectWaterBucket()) {
                 logger.info("Vidage seau restant (${BucketManager.state.waterBucketsCount} restants)")
                 ActionManager.rightClick()
-                waitMs(4000)  // Delai long entre chaque seau (4 secondes)
+                // Delai long entre chaque seau (4s), raccourci si le vidage rapide est active
+                waitMs(if (config.fastBucketEmptying) BotConstants.FAST_EMPTY_BUCKET_DELAY_MS else BotConstants.EMPTY_BUCKET_DELAY_MS)
             }
         } else {
             // Plus de seaux d'eau, on peut terminer
@@ -2554,7 +2577,7 @@ object BotCore {
 
             // Passer en pause
             stateData.state = BotState.PAUSED
-            waitMs(pauseSeconds * 1000)
+            waitUntilTime(stateData.pauseEndTime)
             return
         }
 
@@ -2632,19 +2655,14 @@ object BotCore {
 
         // Passer en pause
         stateData.state = BotState.PAUSED
-        waitMs(pauseSeconds * 1000)
+        waitUntilTime(stateData.pauseEndTime)
     }
 
     private fun handlePaused() {
         // Fin de pause, verifier le type de pause
         if (stateData.isCrashReconnectPause) {
             // Pause due a une deconnexion inattendue (crash)
-            val stations = stateData.cachedStations
-            val currentStation = if (stateData.currentStationIndex < stations.size) {
-                stations[stateData.currentStationIndex]
-            } else {
-                "N/A"
-            }
+            val currentStation = stateData.currentStationName() ?: "N/A"
 
             logger.info("========================================")
             logger.info("FIN DE PAUSE CRASH - RECONNEXION")
@@ -2717,12 +2735,7 @@ object BotCore {
     private fun handleError() {
         // Construire un message d'erreur detaille avec le contexte
         // OPTIMISATION: utiliser le cache au lieu de recalculer
-        val stations = stateData.cachedStations
-        val currentStation = if (stateData.currentStationIndex < stations.size) {
-            stations[stateData.currentStationIndex]
-        } else {
-            "N/A"
-        }
+        val currentStation = stateData.currentStationName() ?: "N/A"
 
         val retryDelaySeconds = config.connectionRetryDelaySeconds
         val errorType = stateData.errorType
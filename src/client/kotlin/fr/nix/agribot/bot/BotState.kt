@@ -34,32 +34,40 @@ enum class ErrorType(val description: String, val isRecoverable: Boolean) {
     UNKNOWN_ERROR("Erreur inconnue", true);
 
     companion object {
+        // Mots-cles -> type d'erreur. La priorite est l'ordre de declaration de l'enum:
+        // si plusieurs types correspondent, le plus haut dans l'enum l'emporte
+        private val KEYWORD_TYPES: Map<String, ErrorType> = mapOf(
+            "connexion" to NETWORK_ERROR, "deconnect" to NETWORK_ERROR,
+            "network" to NETWORK_ERROR, "reseau" to NETWORK_ERROR,
+            "timeout" to TIMEOUT_ERROR, "delai" to TIMEOUT_ERROR, "attente" to TIMEOUT_ERROR,
+            "menu" to MENU_ERROR, "coffre" to MENU_ERROR, "ouvrir" to MENU_ERROR,
+            "station" to STATION_ERROR, "teleport" to STATION_ERROR,
+            "seau" to BUCKET_ERROR, "bucket" to BUCKET_ERROR, "eau" to BUCKET_ERROR,
+            "graine" to SEED_ERROR, "seed" to SEED_ERROR,
+            "config" to CONFIG_ERROR
+        )
+
+        // Tous les mots-cles dans une seule alternation: une passe sur le message au lieu
+        // d'un contains() par mot-cle. Le lookahead capture aussi les mots-cles qui se
+        // chevauchent ("reseau" contient "seau" et "eau")
+        private val KEYWORD_REGEX = Regex(
+            "(?=(" + KEYWORD_TYPES.keys.joinToString("|") { Regex.escape(it) } + "))"
+        )
+
         /**
          * Determine le type d'erreur a partir d'un message d'erreur.
          */
         fun fromMessage(message: String): ErrorType {
-            val lowerMessage = message.lowercase()
-            return when {
-                lowerMessage.contains("connexion") || lowerMessage.contains("deconnect") ||
-                    lowerMessage.contains("network") || lowerMessage.contains("reseau") -> NETWORK_ERROR
-
-                lowerMessage.contains("timeout") || lowerMessage.contains("delai") ||
-                    lowerMessage.contains("attente") -> TIMEOUT_ERROR
-
-                lowerMessage.contains("menu") || lowerMessage.contains("coffre") ||
-                    lowerMessage.contains("ouvrir") -> MENU_ERROR
-
-                lowerMessage.contains("station") || lowerMessage.contains("teleport") -> STATION_ERROR
-
-                lowerMessage.contains("seau") || lowerMessage.contains("bucket") ||
-                    lowerMessage.contains("eau") -> BUCKET_ERROR
-
-                lowerMessage.contains("graine") || lowerMessage.contains("seed") -> SEED_ERROR
-
-                lowerMessage.contains("config") -> CONFIG_ERROR
-
-                else -> UNKNOWN_ERROR
+            var best = UNKNOWN_ERROR
+            for (match in KEYWORD_REGEX.findAll(message.lowercase())) {
+                val type = KEYWORD_TYPES.getValue(match.groupValues[1])
+                if (type.ordinal < best.ordinal) {
+                    best = type
+                    // Priorite maximale: inutile de continuer le parcours
+                    if (best == NETWORK_ERROR) break
+                }
             }
+            return best
         }
     }
 }
@@ -188,6 +196,12 @@ data class BotStateData(
     /** True si au moins un melon a ete trouve dans cette session (pour eviter faux positifs au premier lancement) */
     var melonFoundThisSession: Boolean = false
 ) {
+    /**
+     * Nom de la station en cours, lu dans le cache de la session.
+     * @return null si l'index est hors de la liste (session terminee ou non demarree)
+     */
+    fun currentStationName(): String? = cachedStations.getOrNull(currentStationIndex)
+
     fun reset() {
         state = BotState.IDLE
         currentStationIndex = 0
@@ -4,6 +4,7 @@ import fr.nix.agribot.AgriBotClient
 import fr.nix.agribot.config.AgriConfig
 import net.fabricmc.fabric.api.client.event.lifecycle.v1.ClientTickEvents
 import net.minecraft.client.MinecraftClient
+import net.minecraft.client.gui.screen.Screen
 import net.minecraft.client.gui.screen.multiplayer.ConnectScreen
 import net.minecraft.client.network.ServerAddress
 import net.minecraft.client.network.ServerInfo
@@ -27,12 +28,15 @@ object PreConnectionTimer {
     val isActive: Boolean
         get() = timerEndTime > 0 && System.currentTimeMillis() < timerEndTime
 
-    /** Temps restant en millisecondes */
+    /** Temps restant en millisecondes (une seule lecture de l'horloge) */
     val remainingMs: Long
-        get() = if (isActive) timerEndTime - System.currentTimeMillis() else 0
+        get() {
+            if (timerEndTime <= 0) return 0
+            return (timerEndTime - System.currentTimeMillis()).coerceAtLeast(0)
+        }
 
     /** Reference a l'ecran pour la connexion */
-    private var parentScreen: net.minecraft.client.gui.screen.Screen? = null
+    private var parentScreen: Screen? = null
 
     /**
      * Initialise le gestionnaire et enregistre le tick handler.
@@ -49,7 +53,7 @@ object PreConnectionTimer {
      * @param delayMinutes Duree du delai en minutes
      * @param screen L'ecran parent pour la connexion
      */
-    fun startTimer(delayMinutes: Int, screen: net.minecraft.client.gui.screen.Screen) {
+    fun startTimer(delayMinutes: Int, screen: Screen) {
         if (delayMinutes <= 0) {
             // Pas de delai, connecter immediatement
             connectToServer(screen)
@@ -109,7 +113,7 @@ object PreConnectionTimer {
     /**
      * Se connecte au serveur configure.
      */
-    private fun connectToServer(screen: net.minecraft.client.gui.screen.Screen) {
+    private fun connectToServer(screen: Screen) {
         val config = AgriBotClient.config
         val serverAddress = config.serverAddress
 
@@ -4,9 +4,11 @@ import fr.nix.agribot.config.AutoResponseConfig
 import net.minecraft.client.MinecraftClient
 import org.slf4j.LoggerFactory
 import java.text.Normalizer
+import java.util.concurrent.ConcurrentHashMap
 import java.util.concurrent.ConcurrentLinkedQueue
 import java.util.concurrent.Executors
 import java.util.concurrent.ScheduledExecutorService
+import java.util.concurrent.ScheduledFuture
 import java.util.concurrent.TimeUnit
 import kotlin.random.Random
 
@@ -23,7 +25,15 @@ object AutoResponseManager {
     // Pattern pour normaliser le texte (supprimer accents)
     private val DIACRITICS_PATTERN = "\\p{InCombiningDiacriticalMarks}+".toRegex()
 
-    // Regex pour parser les messages de chat du serveur
+    // Marqueur des lignes de chat dans les logs Minecraft
+    private const val CHAT_LOG_MARKER = "[CHAT]"
+
+    // Codes couleur Minecraft (§x) - compile une seule fois au lieu de a chaque message
+    private val COLOR_CODE_REGEX = Regex("§[0-9a-fk-or]")
+
+    // Regex unique pour parser les messages de chat (serveur OU solo) en une seule passe
+    //
+    // Format serveur (groupes sender/content):
     // Capture le pseudo (commençant par une lettre) juste avant le separateur »
     // Fonctionne avec tous les formats:
     // - [niveau] 《Guilde》Pseudo★ » Message
@@ -31,26 +41,47 @@ object AutoResponseManager {
     // - [Admin] Pseudo » Message
     // - ShopDeGott Pseudo » Message (format shop sans crochets)
     // - Pseudo » Message (format simple)
-    private val CHAT_MESSAGE_REGEX = Regex("""([A-Za-z_][A-Za-z0-9_]*)[★☆⚡☠🌙✨🔥❄☢⭐]*\s*»\s*(.+)$""")
+    //
+    // Format solo/local (groupes soloSender/soloContent):
+    // - < Pseudo> Message ou <Pseudo> Message
+    // Le format serveur garde la priorite: la branche solo n'est essayee que si le motif serveur
+    // ne correspond nulle part dans la ligne (une ligne solo contenant » reste donc parsee en solo)
+    private const val SERVER_CHAT_PATTERN = """[A-Za-z_][A-Za-z0-9_]*[★☆⚡☠🌙✨🔥❄☢⭐]*\s*»\s*.+$"""
+    private val CHAT_MESSAGE_REGEX = Regex(
+        """^(?!.*$SERVER_CHAT_PATTERN)<\s*(?<soloSender>\S+)\s*>\s*(?<soloContent>.+)$""" +
+        """|(?<sender>[A-Za-z_][A-Za-z0-9_]*)[★☆⚡☠🌙✨🔥❄☢⭐]*\s*»\s*(?<content>.+)$"""
+    )
 
     // Pseudos connus comme etant des messages systeme/serveur (pas des joueurs reels)
     // Evite de repondre aux messages de bienvenue, login, etc.
-    private val SYSTEM_SENDERS = setOf(
+    // Comparaison insensible a la casse sans allouer de copie en minuscules du pseudo
+    private val SYSTEM_SENDERS = sortedSetOf(
+        String.CASE_INSENSITIVE_ORDER,
         "survivalworld", "sw", "server", "serveur", "system", "admin",
         // Faux positifs courants des messages de bienvenue (regex match sur "venu »", "mail »", etc.)
         "venu", "mail", "email"
     )
 
-    // Regex pour parser les messages de chat en mode solo/local
-    // Format: < Pseudo> Message ou <Pseudo> Message
-    private val SOLO_CHAT_MESSAGE_REGEX = Regex("""^<\s*(\S+)\s*>\s*(.+)$""")
+    // Variantes exactes d'un "re" (lookup O(1) au lieu d'une chaine de comparaisons)
+    private val RE_MESSAGES = setOf("re", "re!", "re.", "re !")
+
+    // Cache des pseudos normalises (expediteurs, amis): pseudo brut -> pseudo normalise
+    private val normalizedNameCache = ConcurrentHashMap<String, String>()
+    private const val MAX_NORMALIZED_NAME_CACHE = 256
+
+    // Cache du pseudo normalise: (pseudo brut, pseudo normalise)
+    @Volatile
+    private var normalizedPlayerNameCache: Pair<String, String>? = null
+
+    // Cache des amis "damn" normalises: (copie de la liste brute, liste normalisee)
+    @Volatile
+    private var normalizedDamnFriendsCache: Pair<List<String>, List<String>>? = null
 
     // Timestamp de la connexion au serveur de jeu
     private var connectionTimestamp: Long = 0
 
-    // File d'attente des reponses a envoyer (avec delai)
-    private data class PendingResponse(val message: String, val sendTime: Long)
-    private val pendingResponses = ConcurrentLinkedQueue<PendingResponse>()
+    // Envois de reponses programmes (un evenement par reponse, annulables au reset)
+    private val pendingResponses = ConcurrentLinkedQueue<ScheduledFuture<*>>()
 
     // Scheduler pour envoyer les reponses avec delai
     private var scheduler: ScheduledExecutorService? = null
@@ -65,7 +96,8 @@ object AutoResponseManager {
     // Messages recus pendant la phase de connexion (avant ouverture de la fenetre de detection)
     // Ils seront traites des que la fenetre s'ouvre
     private data class BufferedMessage(val rawMessage: String, val timestamp: Long)
-    private val preConnectionBuffer = mutableListOf<BufferedMessage>()
+    // ArrayDeque: retrait du plus ancien en O(1) (au lieu de removeAt(0) qui decale la liste)
+    private val preConnectionBuffer = ArrayDeque<BufferedMessage>()
     private var isBufferingPreConnection = false
     private const val MAX_BUFFER_AGE_MS = 30_000L  // 30 secondes max
     private const val MAX_BUFFER_SIZE = 50
@@ -91,22 +123,23 @@ object AutoResponseManager {
     // ============================================
     // Stocke les derniers messages echanges: sender -> liste de (auteur, message, timestamp)
     data class ConversationMessage(val author: String, val content: String, val timestamp: Long, val isBot: Boolean)
-    private val conversationHistory = mutableMapOf<String, MutableList<ConversationMessage>>()
+    private val conversationHistory = mutableMapOf<String, ArrayDeque<ConversationMessage>>()
     private const val MAX_HISTORY_MESSAGES = 5  // Garder les 5 derniers messages par conversation
 
     // ============================================
     // VARIETE DES REPONSES (eviter repetitions)
     // ============================================
     // Stocke les dernieres reponses envoyees a chaque joueur: sender -> liste de reponses
-    private val recentResponses = mutableMapOf<String, MutableList<String>>()
+    private val recentResponses = mutableMapOf<String, ArrayDeque<String>>()
     private const val MAX_RECENT_RESPONSES = 5  // Garder les 5 dernieres reponses par joueur
 
     // ============================================
     // REGROUPEMENT DE MESSAGES
     // ============================================
     // Messages en attente de regroupement: sender -> (messages, timestamp premier message)
+    // Partage entre le thread du chat (ajout) et le scheduler (traitement)
     data class PendingMessages(val messages: MutableList<String>, val firstMessageTime: Long)
-    private val pendingIncomingMessages = mutableMapOf<String, PendingMessages>()
+    private val pendingIncomingMessages = ConcurrentHashMap<String, PendingMessages>()
     // Delai d'attente pour regrouper les messages (ms)
     private const val MESSAGE_GROUPING_DELAY_MS = 2000L  // 2 secondes
 
@@ -119,16 +152,6 @@ object AutoResponseManager {
             Thread(r, "agribot-autoresponse").apply { isDaemon = true }
         }
 
-        // Tache periodique pour envoyer les reponses en attente
-        scheduler?.scheduleAtFixedRate({
-            processPendingResponses()
-        }, 100, 100, TimeUnit.MILLISECONDS)
-
-        // Tache periodique pour traiter les messages groupes
-        scheduler?.scheduleAtFixedRate({
-            processGroupedMessages()
-        }, 500, 500, TimeUnit.MILLISECONDS)
-
         logger.info("AutoResponseManager initialise")
     }
 
@@ -151,30 +174,33 @@ object AutoResponseManager {
         connectionTimestamp = System.currentTimeMillis()
         processedMessages.clear()
 
-        // Traiter les messages bufferises pendant la connexion
-        if (preConnectionBuffer.isNotEmpty()) {
-            val now = System.currentTimeMillis()
-            val validMessages = preConnectionBuffer.filter { now - it.timestamp < MAX_BUFFER_AGE_MS }
-            if (validMessages.isNotEmpty()) {
-                logger.info("Traitement de ${validMessages.size} message(s) bufferise(s) pendant la connexion")
-                for (buffered in validMessages) {
-                    processMessage(buffered.rawMessage)
-                }
-            }
-        }
-        preConnectionBuffer.clear()
+        // Arreter le buffering avant le rejeu: processMessage ne doit plus rien ajouter au buffer
         isBufferingPreConnection = false
 
+        // Traiter les messages bufferises pendant la connexion (vidage du buffer, sans liste intermediaire)
+        val now = System.currentTimeMillis()
+        var replayed = 0
+        while (true) {
+            val buffered = preConnectionBuffer.removeFirstOrNull() ?: break
+            if (now - buffered.timestamp >= MAX_BUFFER_AGE_MS) continue
+            processMessage(buffered.rawMessage)
+            replayed++
+        }
+        if (replayed > 0) {
+            logger.info("$replayed message(s) bufferise(s) pendant la connexion traite(s)")
+        }
+
         logger.info("Fenetre de detection auto-reponse activee pour ${AutoResponseConfig.get().detectionWindowSeconds}s")
         ChatManager.showLocalMessage("Auto-reponse active (${AutoResponseConfig.get().detectionWindowSeconds}s)", "a")
     }
 
     /**
      * Verifie si on est dans la fenetre de detection.
+     * @param now Horodatage courant, fourni par l'appelant s'il l'a deja lu
      */
-    fun isInDetectionWindow(): Boolean {
+    fun isInDetectionWindow(now: Long = System.currentTimeMillis()): Boolean {
         if (connectionTimestamp == 0L) return false
-        val elapsed = System.currentTimeMillis() - connectionTimestamp
+        val elapsed = now - connectionTimestamp
         val windowMs = AutoResponseConfig.get().detectionWindowSeconds * 1000L
         return elapsed < windowMs
     }
@@ -200,11 +226,9 @@ object AutoResponseManager {
         // Verifier si le systeme est active
         if (!config.enabled && !config.testModeActive) return
 
-        // Extraire le contenu du message de chat (format serveur ou solo)
-        val chatContent = extractChatContent(rawMessage)
-
         // Mode test: traiter les messages "msg:xxx"
         if (config.testModeActive) {
+            val chatContent = extractChatContent(rawMessage)
             // Verifier si le contenu du message contient "msg:"
             if (chatContent != null && chatContent.content.startsWith("msg:", ignoreCase = true)) {
                 val testMessage = chatContent.content.substringAfter("msg:").trim()
@@ -218,21 +242,30 @@ object AutoResponseManager {
             return
         }
 
+        // Une seule lecture de l'horloge par message, reutilisee pour la fenetre de
+        // detection, le buffer pre-connexion, l'historique et le regroupement
+        val now = System.currentTimeMillis()
+
         // Mode normal: verifier qu'on est dans la fenetre de detection
-        if (!isInDetectionWindow()) {
-            // Si on est en phase de connexion, bufferiser le message pour traitement ulterieur
-            if (isBufferingPreConnection) {
-                preConnectionBuffer.add(BufferedMessage(rawMessage, System.currentTimeMillis()))
+        // (avant tout parsing: hors fenetre et hors connexion, le message est ignore tel quel)
+        if (!isInDetectionWindow(now)) {
+            // Si on est en phase de connexion, bufferiser le message pour traitement ulterieur.
+            // Seuls les vrais messages de chat sont gardes: les messages systeme seraient
+            // ignores au rejeu et pourraient evincer des messages de joueurs du buffer borne
+            if (isBufferingPreConnection && extractChatContent(rawMessage) != null) {
+                preConnectionBuffer.add(BufferedMessage(rawMessage, now))
                 if (preConnectionBuffer.size > MAX_BUFFER_SIZE) {
-                    preConnectionBuffer.removeAt(0)
+                    preConnectionBuffer.removeFirst()
+                }
+                if (logger.isDebugEnabled) {
+                    logger.debug("Message bufferise pendant connexion: {}", rawMessage.take(80))
                 }
-                logger.debug("Message bufferise pendant connexion: ${rawMessage.take(80)}")
             }
             return
         }
 
-        // Le contenu doit etre valide
-        if (chatContent == null) return
+        // Extraire le contenu du message de chat (format serveur ou solo)
+        val chatContent = extractChatContent(rawMessage) ?: return
 
         // Verifier si deja traite
         val messageKey = "${chatContent.sender}:${chatContent.content}"
@@ -246,20 +279,23 @@ object AutoResponseManager {
         logger.info("Message recu de ${chatContent.sender}: ${chatContent.content}")
 
         // Ajouter a l'historique de conversation
-        addToConversationHistory(chatContent.sender, chatContent.sender, chatContent.content, false)
+        addToConversationHistory(chatContent.sender, chatContent.sender, chatContent.content, false, now)
+
+        // Normaliser le contenu une seule fois pour toutes les verifications rapides
+        val normalizedContent = normalizeText(chatContent.content)
 
         // Verifier d'abord les reponses speciales (damn)
-        if (checkDamnResponse(chatContent.sender, chatContent.content)) {
+        if (checkDamnResponse(chatContent.sender, chatContent.content, normalizedContent)) {
             return
         }
 
         // Verifier si c'est un "re" (reponse rapide ~1s)
-        if (checkReResponse(chatContent.sender, chatContent.content)) {
+        if (checkReResponse(chatContent.sender, chatContent.content, normalizedContent)) {
             return
         }
 
         // Ajouter le message a la file de regroupement au lieu de traiter immediatement
-        addToPendingMessages(chatContent.sender, chatContent.content)
+        addToPendingMessages(chatContent.sender, chatContent.content, now)
     }
 
     /**
@@ -278,19 +314,17 @@ object AutoResponseManager {
         logger.info("[MODE TEST] Message: \"$message\"")
 
         // Verifier d'abord les reponses speciales (damn)
-        val normalizedSender = normalizeText(sender)
-        val isDamnFriend = config.damnFriends.any { friend ->
-            normalizedSender.contains(normalizeText(friend), ignoreCase = true)
-        }
-        logger.info("[MODE TEST] Est ami damn: $isDamnFriend (amis: ${config.damnFriends})")
+        val damnFriend = isDamnFriend(sender, config)
+        logger.info("[MODE TEST] Est ami damn: $damnFriend (amis: ${config.damnFriends})")
 
-        if (checkDamnResponse(sender, message)) {
+        val normalizedMessage = normalizeText(message)
+        if (checkDamnResponse(sender, message, normalizedMessage)) {
             logger.info("[MODE TEST] -> Reponse damn declenchee!")
             return
         }
 
         // Verifier si c'est un "re"
-        if (checkReResponse(sender, message)) {
+        if (checkReResponse(sender, message, normalizedMessage)) {
             logger.info("[MODE TEST] -> Reponse 're' declenchee!")
             return
         }
@@ -375,6 +409,11 @@ object AutoResponseManager {
                             }
                             logger.info("[MODE TEST] ====================================")
                         }
+                        .exceptionally { e ->
+                            logger.error("[MODE TEST] ERREUR generation: ${e.message}")
+                            logger.info("[MODE TEST] ====================================")
+                            null
+                        }
                 } else {
                     logger.info("[MODE TEST] -> Pas de reponse necessaire")
                     logger.info("[MODE TEST] ====================================")
@@ -390,19 +429,14 @@ object AutoResponseManager {
 
     /**
      * Verifie si c'est un message "damn" d'un ami et repond en consequence.
+     * @param normalizedMessage Message deja normalise par l'appelant
      * @return true si une reponse damn a ete envoyee
      */
-    private fun checkDamnResponse(sender: String, message: String): Boolean {
+    private fun checkDamnResponse(sender: String, message: String, normalizedMessage: String): Boolean {
         val config = AutoResponseConfig.get()
-        val normalizedMessage = normalizeText(message)
-        val normalizedSender = normalizeText(sender)
 
         // Verifier si c'est un ami "damn"
-        val isDamnFriend = config.damnFriends.any { friend ->
-            normalizedSender.contains(normalizeText(friend), ignoreCase = true)
-        }
-
-        if (!isDamnFriend) return false
+        if (!isDamnFriend(sender, config)) return false
 
         // Verifier les patterns "damn"
         if (normalizedMessage.contains("damn neige") || normalizedMessage == "damn") {
@@ -420,35 +454,44 @@ object AutoResponseManager {
             return true
         }
 
-        // Verifier les patterns de salutation apres "damn" (ca va, cv, etc.)
-        val greetingPatterns = listOf("ca va", "cv", "cv?", "ca va?", "ca va trql", "ca va ou quoi")
-        val isGreeting = greetingPatterns.any { pattern ->
-            normalizedMessage.contains(normalizeText(pattern))
-        }
+        // Les salutations d'un ami damn (ca va, cv, etc.) suivent le traitement normal (API Mistral)
+        return false
+    }
 
-        if (isGreeting) {
-            // Pour les salutations d'un ami damn, utiliser l'API Mistral
-            // mais on retourne false pour laisser le traitement normal
-            return false
-        }
+    /**
+     * Verifie si l'expediteur fait partie des amis "damn".
+     * Les pseudos normalises sont deja en minuscules: contains() simple, sans ignoreCase.
+     */
+    private fun isDamnFriend(sender: String, config: AutoResponseConfig): Boolean {
+        val normalizedSender = normalizeName(sender)
+        return getNormalizedDamnFriends(config.damnFriends).any { normalizedSender.contains(it) }
+    }
 
-        return false
+    /**
+     * Retourne la liste des amis "damn" normalises, recalculee uniquement quand la liste change
+     * (edition depuis l'ecran d'auto-reponse), au lieu d'une recherche par ami a chaque message.
+     */
+    private fun getNormalizedDamnFriends(friends: List<String>): List<String> {
+        val cached = normalizedDamnFriendsCache
+        if (cached != null && cached.first == friends) return cached.second
+
+        val normalized = friends.map { normalizeText(it) }
+        normalizedDamnFriendsCache = friends.toList() to normalized
+        return normalized
     }
 
     /**
      * Verifie si c'est un message "re" et repond en consequence.
      * Delai de reponse: ~1 seconde.
+     * @param normalizedMessage Message deja normalise par l'appelant
      * @return true si une reponse "re" a ete envoyee
      */
-    private fun checkReResponse(sender: String, message: String): Boolean {
+    private fun checkReResponse(sender: String, message: String, normalizedMessage: String): Boolean {
         val config = AutoResponseConfig.get()
-        val normalizedMessage = normalizeText(message).trim()
+        val trimmedMessage = normalizedMessage.trim()
 
         // Verifier si le message est exactement "re" (avec ou sans ponctuation)
-        val isRe = normalizedMessage == "re" ||
-                   normalizedMessage == "re!" ||
-                   normalizedMessage == "re." ||
-                   normalizedMessage == "re !"
+        val isRe = trimmedMessage in RE_MESSAGES
 
         if (!isRe) return false
 
@@ -467,8 +510,19 @@ object AutoResponseManager {
      */
     private fun isPlayerMentioned(message: String, playerName: String): Boolean {
         val normalizedMessage = normalizeText(message)
-        val normalizedPlayerName = normalizeText(playerName)
-        return normalizedMessage.contains(normalizedPlayerName)
+        return normalizedMessage.contains(getNormalizedPlayerName(playerName))
+    }
+
+    /**
+     * Retourne le pseudo normalise, recalcule uniquement quand le pseudo change.
+     */
+    private fun getNormalizedPlayerName(playerName: String): String {
+        val cached = normalizedPlayerNameCache
+        if (cached != null && cached.first == playerName) return cached.second
+
+        val normalized = normalizeText(playerName)
+        normalizedPlayerNameCache = playerName to normalized
+        return normalized
     }
 
     /**
@@ -558,6 +612,10 @@ object AutoResponseManager {
                                 logger.info("Reponse programmee [${analysis.category}]: $response")
                             }
                         }
+                        .exceptionally { e ->
+                            logger.warn("Erreur lors de la generation de la reponse a $sender: ${e.message}")
+                            null
+                        }
                 } else {
                     logger.debug("Message ignore: $message (${analysis.reason})")
                 }
@@ -575,8 +633,16 @@ object AutoResponseManager {
      */
     private fun scheduleResponse(message: String, customDelayMs: Long? = null) {
         val delay = customDelayMs ?: calculateTypingDelay(message)
-        val sendTime = System.currentTimeMillis() + delay
-        pendingResponses.add(PendingResponse(message, sendTime))
+
+        // Un seul evenement planifie par reponse (plus de scrutation toutes les 100ms):
+        // chaque reponse part a son heure, sans attendre celles programmees avant elle
+        val future = scheduler?.schedule({ sendResponse(message) }, delay, TimeUnit.MILLISECONDS) ?: run {
+            logger.warn("Scheduler non initialise - reponse '$message' ignoree")
+            return
+        }
+
+        pendingResponses.removeIf { it.isDone }
+        pendingResponses.add(future)
         logger.info("Reponse '$message' programmee dans ${delay}ms")
     }
 
@@ -599,24 +665,6 @@ object AutoResponseManager {
         return reactionDelay + typingTime + variation
     }
 
-    /**
-     * Traite les reponses en attente et les envoie quand le moment est venu.
-     */
-    private fun processPendingResponses() {
-        val now = System.currentTimeMillis()
-
-        while (true) {
-            val pending = pendingResponses.peek() ?: break
-
-            if (now >= pending.sendTime) {
-                pendingResponses.poll()
-                sendResponse(pending.message)
-            } else {
-                break
-            }
-        }
-    }
-
     /**
      * Envoie une reponse dans le chat.
      */
@@ -651,52 +699,59 @@ object AutoResponseManager {
 
         // Supprimer le prefixe de log Minecraft si present
         // Format: [HH:MM:SS] [Thread/LEVEL]: [System] [CHAT] message
-        if (message.contains("[CHAT]")) {
-            message = message.substringAfter("[CHAT]").trim()
+        // OPTIMISATION: une seule recherche du marqueur, puis decoupe directe
+        val chatIndex = message.indexOf(CHAT_LOG_MARKER)
+        if (chatIndex >= 0) {
+            message = message.substring(chatIndex + CHAT_LOG_MARKER.length).trim()
+        }
+
+        // Supprimer les codes couleur Minecraft (§x) - regex evitee si aucun code present
+        if (message.indexOf('§') >= 0) {
+            message = COLOR_CODE_REGEX.replace(message, "")
         }
 
-        // Supprimer les codes couleur Minecraft (§x)
-        message = message.replace(Regex("§[0-9a-fk-or]"), "")
+        // Prefiltre: le format serveur exige un », le format solo commence par <.
+        // La plupart des lignes systeme n'ont ni l'un ni l'autre: rejet sans passer par la regex
+        if (!message.startsWith('<') && message.indexOf('»') < 0) return null
+
+        // Une seule passe regex pour les deux formats
+        val match = CHAT_MESSAGE_REGEX.find(message) ?: run {
+            // Log si le message contient » mais n'a pas ete parse (potentiel bug)
+            if (message.contains("»")) {
+                logger.debug("Message avec » non parse: '{}'", message)
+            }
+            return null
+        }
 
-        // 1. Parser le format du serveur multijoueur
+        // 1. Format du serveur multijoueur
         // Capture le pseudo (commençant par une lettre) juste avant »
-        val serverMatch = CHAT_MESSAGE_REGEX.find(message)
-        if (serverMatch != null) {
-            val sender = serverMatch.groupValues[1].trim()
-            val content = serverMatch.groupValues[2].trim()
+        val serverSender = match.groups["sender"]
+        if (serverSender != null) {
+            val sender = serverSender.value.trim()
+            val content = match.groups["content"]!!.value.trim()
 
             // Filtrer les faux positifs: messages systeme/serveur et pseudos invalides
-            if (sender.lowercase() in SYSTEM_SENDERS) {
-                logger.debug("Message systeme ignore: sender='$sender' (raw: '$message')")
+            if (sender in SYSTEM_SENDERS) {
+                logger.debug("Message systeme ignore: sender='{}' (raw: '{}')", sender, message)
                 return null
             }
 
             // Un pseudo Minecraft valide fait entre 3 et 16 caracteres
             if (sender.length < 3 || sender.length > 16) {
-                logger.debug("Pseudo invalide ignore (longueur ${sender.length}): '$sender' (raw: '$message')")
+                logger.debug("Pseudo invalide ignore (longueur {}): '{}' (raw: '{}')", sender.length, sender, message)
                 return null
             }
 
-            logger.debug("Message parse: sender='$sender', content='$content' (raw: '$message')")
+            logger.debug("Message parse: sender='{}', content='{}' (raw: '{}')", sender, content, message)
             return ChatContent(sender, content)
         }
 
-        // 2. Parser le format solo/local
+        // 2. Format solo/local
         // Format: < Pseudo> Message ou <Pseudo> Message
-        val soloMatch = SOLO_CHAT_MESSAGE_REGEX.find(message)
-        if (soloMatch != null) {
-            val sender = soloMatch.groupValues[1].trim()
-            val content = soloMatch.groupValues[2].trim()
-            logger.debug("Message solo parse: sender='$sender', content='$content'")
-            return ChatContent(sender, content)
-        }
-
-        // Log si le message contient » mais n'a pas ete parse (potentiel bug)
-        if (message.contains("»")) {
-            logger.debug("Message avec » non parse: '$message'")
-        }
-
-        return null
+        val sender = match.groups["soloSender"]!!.value.trim()
+        val content = match.groups["soloContent"]!!.value.trim()
+        logger.debug("Message solo parse: sender='{}', content='{}'", sender, content)
+        return ChatContent(sender, content)
     }
 
     /**
@@ -707,6 +762,21 @@ object AutoResponseManager {
         return DIACRITICS_PATTERN.replace(normalized, "").lowercase()
     }
 
+    /**
+     * Normalise un pseudo avec cache: les memes joueurs reviennent sans cesse dans le chat,
+     * inutile de refaire Normalizer + regex a chaque message.
+     */
+    private fun normalizeName(name: String): String {
+        normalizedNameCache[name]?.let { return it }
+
+        if (normalizedNameCache.size >= MAX_NORMALIZED_NAME_CACHE) {
+            normalizedNameCache.clear()
+        }
+        val normalized = normalizeText(name)
+        normalizedNameCache[name] = normalized
+        return normalized
+    }
+
     /**
      * Recupere le pseudo du joueur.
      */
@@ -769,7 +839,7 @@ object AutoResponseManager {
      * Une conversation est active si on a echange avec ce joueur dans les 30 dernieres secondes.
      */
     private fun hasActiveConversation(sender: String): Boolean {
-        val normalizedSender = normalizeText(sender)
+        val normalizedSender = normalizeName(sender)
         val lastInteraction = activeConversations[normalizedSender] ?: return false
         val elapsed = System.currentTimeMillis() - lastInteraction
         return elapsed < CONVERSATION_TIMEOUT_MS
@@ -779,7 +849,7 @@ object AutoResponseManager {
      * Marque une conversation comme active (apres avoir repondu).
      */
     private fun markConversationActive(sender: String) {
-        val normalizedSender = normalizeText(sender)
+        val normalizedSender = normalizeName(sender)
         activeConversations[normalizedSender] = System.currentTimeMillis()
         logger.debug("Conversation active avec $sender")
 
@@ -802,6 +872,7 @@ object AutoResponseManager {
      */
     fun reset() {
         connectionTimestamp = 0
+        pendingResponses.forEach { it.cancel(false) }
         pendingResponses.clear()
         processedMessages.clear()
         activeConversations.clear()
@@ -822,16 +893,23 @@ object AutoResponseManager {
      * @param author L'auteur du message (peut etre le bot ou le joueur)
      * @param content Le contenu du message
      * @param isBot True si c'est une reponse du bot
+     * @param timestamp Horodatage du message
      */
-    private fun addToConversationHistory(sender: String, author: String, content: String, isBot: Boolean) {
-        val normalizedSender = normalizeText(sender)
-        val history = conversationHistory.getOrPut(normalizedSender) { mutableListOf() }
-
-        history.add(ConversationMessage(author, content, System.currentTimeMillis(), isBot))
+    private fun addToConversationHistory(
+        sender: String,
+        author: String,
+        content: String,
+        isBot: Boolean,
+        timestamp: Long = System.currentTimeMillis()
+    ) {
+        val normalizedSender = normalizeName(sender)
+        val history = conversationHistory.getOrPut(normalizedSender) { ArrayDeque(MAX_HISTORY_MESSAGES + 1) }
+
+        history.addLast(ConversationMessage(author, content, timestamp, isBot))
 
         // Limiter a MAX_HISTORY_MESSAGES
         while (history.size > MAX_HISTORY_MESSAGES) {
-            history.removeAt(0)
+            history.removeFirst()
         }
     }
 
@@ -841,7 +919,7 @@ object AutoResponseManager {
      * @return Liste des messages recents (auteur: message)
      */
     fun getConversationHistoryForApi(sender: String): List<String> {
-        val normalizedSender = normalizeText(sender)
+        val normalizedSender = normalizeName(sender)
         val history = conversationHistory[normalizedSender] ?: return emptyList()
 
         // Filtrer les messages trop vieux (plus de 2 minutes)
@@ -862,14 +940,14 @@ object AutoResponseManager {
      * Ajoute une reponse aux reponses recentes pour un joueur.
      */
     private fun addRecentResponse(sender: String, response: String) {
-        val normalizedSender = normalizeText(sender)
-        val responses = recentResponses.getOrPut(normalizedSender) { mutableListOf() }
+        val normalizedSender = normalizeName(sender)
+        val responses = recentResponses.getOrPut(normalizedSender) { ArrayDeque(MAX_RECENT_RESPONSES + 1) }
 
-        responses.add(response.lowercase())
+        responses.addLast(response.lowercase())
 
         // Limiter a MAX_RECENT_RESPONSES
         while (responses.size > MAX_RECENT_RESPONSES) {
-            responses.removeAt(0)
+            responses.removeFirst()
         }
     }
 
@@ -877,7 +955,7 @@ object AutoResponseManager {
      * Recupere les dernieres reponses envoyees a un joueur.
      */
     fun getRecentResponsesForApi(sender: String): List<String> {
-        val normalizedSender = normalizeText(sender)
+        val normalizedSender = normalizeName(sender)
         return recentResponses[normalizedSender]?.toList() ?: emptyList()
     }
 
@@ -887,56 +965,64 @@ object AutoResponseManager {
 
     /**
      * Ajoute un message a la file d'attente de regroupement.
-     * Le message sera traite apres MESSAGE_GROUPING_DELAY_MS si aucun autre message n'arrive.
+     * Le premier message d'un groupe programme son traitement apres MESSAGE_GROUPING_DELAY_MS;
+     * les messages suivants du meme joueur rejoignent ce groupe.
      */
-    private fun addToPendingMessages(sender: String, content: String) {
-        val normalizedSender = normalizeText(sender)
-        val now = System.currentTimeMillis()
-
-        val pending = pendingIncomingMessages.getOrPut(normalizedSender) {
-            PendingMessages(mutableListOf(), now)
+    private fun addToPendingMessages(sender: String, content: String, now: Long) {
+        val normalizedSender = normalizeName(sender)
+
+        // Ajout dans compute(): atomique vis-a-vis du retrait du groupe par le scheduler
+        var isNewGroup = false
+        var groupSize = 0
+        val pending = pendingIncomingMessages.compute(normalizedSender) { _, existing ->
+            val group = existing ?: PendingMessages(mutableListOf(), now).also { isNewGroup = true }
+            group.messages.add(content)
+            groupSize = group.messages.size
+            group
+        }!!
+
+        logger.debug("Message ajoute a la file de regroupement pour {} ({} messages)", sender, groupSize)
+
+        // Un evenement par groupe au lieu d'une scrutation de la file toutes les 500ms
+        if (isNewGroup) {
+            scheduler?.schedule({ processGroupedMessages(normalizedSender, pending) }, MESSAGE_GROUPING_DELAY_MS, TimeUnit.MILLISECONDS)
+                ?: logger.warn("Scheduler non initialise - messages de $sender non traites")
         }
-
-        pending.messages.add(content)
-        logger.debug("Message ajoute a la file de regroupement pour $sender (${pending.messages.size} messages)")
     }
 
     /**
-     * Traite les messages groupes dont le delai d'attente est expire.
-     * Appele periodiquement par le scheduler.
+     * Traite le groupe de messages d'un joueur une fois le delai de regroupement expire.
+     * Appele par le scheduler, une fois par groupe.
      */
-    private fun processGroupedMessages() {
-        val now = System.currentTimeMillis()
-        val playerName = getPlayerUsername()
-
-        // Copier les cles pour eviter ConcurrentModificationException
-        val sendersToProcess = pendingIncomingMessages.keys.toList()
-
-        for (sender in sendersToProcess) {
-            val pending = pendingIncomingMessages[sender] ?: continue
-
-            // Verifier si le delai est expire
-            if (now - pending.firstMessageTime >= MESSAGE_GROUPING_DELAY_MS) {
-                // Retirer de la file d'attente
-                pendingIncomingMessages.remove(sender)
+    private fun processGroupedMessages(sender: String, pending: PendingMessages) {
+        // Retirer de la file d'attente, seulement si c'est toujours ce groupe
+        // (apres un reset, un nouveau groupe a son propre traitement programme).
+        // Copie des messages sous le meme verrou que l'ajout: aucun message ne peut arriver apres la copie
+        var messages: List<String> = emptyList()
+        pendingIncomingMessages.computeIfPresent(sender) { _, current ->
+            if (current === pending) {
+                messages = current.messages.toList()
+                null
+            } else {
+                current
+            }
+        }
 
-                if (pending.messages.isEmpty()) continue
+        if (messages.isEmpty()) return
 
-                // Combiner les messages si plusieurs
-                val combinedMessage = if (pending.messages.size == 1) {
-                    pending.messages[0]
-                } else {
-                    // Joindre les messages avec " | " pour l'API
-                    logger.info("Regroupement de ${pending.messages.size} messages de $sender")
-                    pending.messages.joinToString(" | ")
-                }
+        // Combiner les messages si plusieurs
+        val combinedMessage = if (messages.size == 1) {
+            messages[0]
+        } else {
+            // Joindre les messages avec " | " pour l'API
+            logger.info("Regroupement de ${messages.size} messages de $sender")
+            messages.joinToString(" | ")
+        }
 
-                // Retrouver le sender original (non normalise) - on utilise le premier caractere en majuscule
-                val originalSender = sender.replaceFirstChar { it.uppercase() }
+        // Retrouver le sender original (non normalise) - on utilise le premier caractere en majuscule
+        val originalSender = sender.replaceFirstChar { it.uppercase() }
 
-                // Traiter le message (ou le groupe de messages)
-                analyzeAndRespond(originalSender, combinedMessage, playerName)
-            }
-        }
+        // Traiter le message (ou le groupe de messages)
+        analyzeAndRespond(originalSender, combinedMessage, getPlayerUsername())
     }
 }
@@ -1,5 +1,7 @@
 package fr.nix.agribot.chat
 
+import kotlinx.coroutines.CompletableDeferred
+import kotlinx.coroutines.withTimeoutOrNull
 import org.slf4j.LoggerFactory
 import java.text.Normalizer
 import java.util.concurrent.CopyOnWriteArrayList
@@ -31,6 +33,14 @@ object ChatListener {
         "a ete teleporte"
     )
 
+    // Tous les mots-cles fusionnes en une seule alternation: une passe sur le message
+    // au lieu d'un contains() par mot-cle
+    private val FORCED_TELEPORT_REGEX = Regex(FORCED_TELEPORT_KEYWORDS.joinToString("|") { Regex.escape(it) })
+
+    // Un message plus court que le plus petit mot-cle ne peut pas en contenir:
+    // on evite alors la normalisation (Normalizer + regex) pour les messages courts
+    private val FORCED_TELEPORT_MIN_LENGTH = FORCED_TELEPORT_KEYWORDS.minOf { it.length }
+
     // Pattern indiquant une teleportation initiee par le bot (a ignorer)
     // Format: "Téléporté au home: nomDuHome"
     private const val HOME_TELEPORT_PATTERN = "teleporte au home:"
@@ -64,29 +74,13 @@ object ChatListener {
             lastMessage = message
 
             // Detection station pleine
+            // Le message de station pleine ne parle jamais de teleportation: s'il correspond,
+            // les detections de teleportation (dont la normalisation) sont sautees
             if (message.contains(STATION_FULL_MESSAGE)) {
                 stationFullDetected = true
                 logger.info("Detection: Station pleine!")
-            }
-
-            // Detection teleportation
-            if (message.contains(TELEPORT_MESSAGE)) {
-                teleportDetected = true
-                logger.debug("Detection: Teleportation effectuee")
-            }
-
-            // Detection teleportation forcee (event actif)
-            // Normaliser le message en minuscules et sans accents pour comparaison
-            val normalizedMessage = normalizeForComparison(message)
-
-            // Verifier d'abord si c'est une teleportation vers un home (initiee par le bot)
-            val isHomeTeleport = normalizedMessage.contains(HOME_TELEPORT_PATTERN)
-
-            if (!isHomeTeleport && FORCED_TELEPORT_KEYWORDS.any { keyword -> normalizedMessage.contains(keyword) }) {
-                forcedTeleportDetected = true
-                logger.warn("Detection: Teleportation forcee (event actif)! Message: $message")
-            } else if (isHomeTeleport) {
-                logger.debug("Teleportation home ignoree: $message")
+            } else {
+                detectTeleport(message)
             }
 
             // Traiter le message pour l'auto-reponse
@@ -115,6 +109,33 @@ object ChatListener {
         }
     }
 
+    /**
+     * Detection des teleportations: confirmation d'un /home et teleportation forcee (event actif).
+     */
+    private fun detectTeleport(message: String) {
+        // Detection teleportation
+        if (message.contains(TELEPORT_MESSAGE)) {
+            teleportDetected = true
+            logger.debug("Detection: Teleportation effectuee")
+        }
+
+        // Detection teleportation forcee (event actif)
+        if (message.length >= FORCED_TELEPORT_MIN_LENGTH) {
+            // Normaliser le message en minuscules et sans accents pour comparaison
+            val normalizedMessage = normalizeForComparison(message)
+
+            // Verifier d'abord si c'est une teleportation vers un home (initiee par le bot)
+            val isHomeTeleport = normalizedMessage.contains(HOME_TELEPORT_PATTERN)
+
+            if (!isHomeTeleport && FORCED_TELEPORT_REGEX.containsMatchIn(normalizedMessage)) {
+                forcedTeleportDetected = true
+                logger.warn("Detection: Teleportation forcee (event actif)! Message: $message")
+            } else if (isHomeTeleport) {
+                logger.debug("Teleportation home ignoree: {}", message)
+            }
+        }
+    }
+
     /**
      * Normalise un texte pour la comparaison (minuscules, sans accents).
      * Optimise: utilise java.text.Normalizer au lieu de 13 replace() en chaine.
@@ -177,25 +198,22 @@ object ChatListener {
      * @return true si detecte, false si timeout
      */
     suspend fun waitForMessage(text: String, timeoutMs: Long = 10000): Boolean {
-        val startTime = System.currentTimeMillis()
-        var detected = false
+        // Evenementiel: le callback complete le signal des que le message arrive,
+        // au lieu de verifier un flag toutes les 100ms
+        val signal = CompletableDeferred<Unit>()
 
         val callback: (String) -> Unit = { message ->
             if (message.contains(text)) {
-                detected = true
+                signal.complete(Unit)
             }
         }
 
         registerCallback(callback)
 
-        try {
-            while (!detected && (System.currentTimeMillis() - startTime) < timeoutMs) {
-                kotlinx.coroutines.delay(100)
-            }
+        return try {
+            withTimeoutOrNull(timeoutMs) { signal.await() } != null
         } finally {
             unregisterCallback(callback)
         }
-
-        return detected
     }
 }
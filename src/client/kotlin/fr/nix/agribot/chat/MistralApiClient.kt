@@ -1,14 +1,21 @@
 package fr.nix.agribot.chat
 
 import com.google.gson.Gson
+import com.google.gson.JsonArray
 import com.google.gson.JsonObject
 import com.google.gson.JsonParser
 import fr.nix.agribot.config.AutoResponseConfig
 import org.slf4j.LoggerFactory
+import java.io.IOException
 import java.net.HttpURLConnection
 import java.net.URI
+import java.util.EnumMap
+import java.util.concurrent.ArrayBlockingQueue
 import java.util.concurrent.CompletableFuture
-import java.util.concurrent.Executors
+import java.util.concurrent.RejectedExecutionException
+import java.util.concurrent.ThreadPoolExecutor
+import java.util.concurrent.TimeUnit
+import java.util.function.Supplier
 
 /**
  * Client pour l'API Mistral avec systeme de classification a 2 etapes.
@@ -18,13 +25,50 @@ import java.util.concurrent.Executors
 object MistralApiClient {
     private val logger = LoggerFactory.getLogger("agribot")
     private val gson = Gson()
-    private val executor = Executors.newSingleThreadExecutor { r ->
-        Thread(r, "agribot-mistral").apply { isDaemon = true }
+
+    // Nombre max de requetes API en attente (au-dela, la nouvelle requete est refusee)
+    private const val MAX_PENDING_REQUESTS = 8
+
+    // Thread unique avec file bornee: une rafale de messages ne peut pas accumuler
+    // des requetes perimees qui retarderaient les reponses aux messages recents
+    private val executor = ThreadPoolExecutor(
+        1, 1, 0L, TimeUnit.MILLISECONDS,
+        ArrayBlockingQueue(MAX_PENDING_REQUESTS),
+        { r -> Thread(r, "agribot-mistral").apply { isDaemon = true } },
+        { _, _ ->
+            logger.warn("File d'attente API Mistral pleine - nouvelle requete refusee")
+            throw RejectedExecutionException("File d'attente API Mistral pleine")
+        }
+    )
+
+    /**
+     * Soumet une tache a l'executeur API.
+     * Une requete refusee (file pleine) donne un future en erreur: le .exceptionally de l'appelant est appele.
+     */
+    private fun <T> submit(task: () -> T): CompletableFuture<T> {
+        return try {
+            CompletableFuture.supplyAsync(Supplier { task() }, executor)
+        } catch (e: RejectedExecutionException) {
+            CompletableFuture.failedFuture(e)
+        }
     }
 
     private const val API_URL = "https://api.mistral.ai/v1/chat/completions"
     private const val MODEL = "mistral-small-latest"
 
+    // Retentatives sur erreurs transitoires (429 / 5xx)
+    private const val MAX_API_RETRIES = 2
+    private const val API_RETRY_DELAY_MS = 1000L
+
+    // Prefixe parasite parfois ajoute par le modele ("Reponse: ...", "Message: ...")
+    private val RESPONSE_PREFIX_REGEX = Regex("^(Reponse|Message)\\s*:\\s*", RegexOption.IGNORE_CASE)
+
+    // Longueur max d'une reponse envoyee dans le chat
+    private const val MAX_RESPONSE_LENGTH = 50
+
+    // URL resolue une seule fois (au lieu d'un parse URI -> URL a chaque appel)
+    private val apiUrl = URI(API_URL).toURL()
+
     /**
      * Categories de messages detectables.
      */
@@ -56,11 +100,11 @@ object MistralApiClient {
      * @param conversationHistory Historique des derniers messages de la conversation
      */
     fun analyzeMessage(message: String, playerUsername: String, senderName: String, hasActiveConversation: Boolean = false, conversationHistory: List<String> = emptyList()): CompletableFuture<MessageAnalysis> {
-        return CompletableFuture.supplyAsync({
+        return submit {
             try {
                 val config = AutoResponseConfig.get()
                 if (!config.isApiConfigured()) {
-                    return@supplyAsync MessageAnalysis(false, MessageCategory.IGNORE, "API non configuree")
+                    return@submit MessageAnalysis(false, MessageCategory.IGNORE, "API non configuree")
                 }
 
                 // Construire le contexte conversationnel
@@ -146,7 +190,7 @@ Exemple: CONFUSION - demande de clarification"""
                 logger.error("Erreur lors de la classification: ${e.message}")
                 MessageAnalysis(false, MessageCategory.IGNORE, "Erreur: ${e.message}")
             }
-        }, executor)
+        }
     }
 
     /**
@@ -155,11 +199,11 @@ Exemple: CONFUSION - demande de clarification"""
      * @param recentResponses Les dernieres reponses envoyees a ce joueur (pour eviter repetitions)
      */
     fun generateResponse(originalMessage: String, senderName: String, playerUsername: String, category: MessageCategory = MessageCategory.GREETING, conversationHistory: List<String> = emptyList(), recentResponses: List<String> = emptyList()): CompletableFuture<String> {
-        return CompletableFuture.supplyAsync({
+        return submit {
             try {
                 val config = AutoResponseConfig.get()
                 if (!config.isApiConfigured()) {
-                    return@supplyAsync ""
+                    return@submit ""
                 }
 
                 val systemPrompt = buildResponsePrompt(playerUsername, category, conversationHistory, recentResponses)
@@ -177,16 +221,13 @@ Exemple: CONFUSION - demande de clarification"""
                     logger.info("[API] Reponse brute: \"$response\"")
                 }
 
-                // Nettoyer la reponse
-                var cleanResponse = response.trim()
+                // Nettoyer la reponse (guillemets puis prefixe "Reponse:" / "Message:")
+                val unquoted = response.trim()
                     .removePrefix("\"").removeSuffix("\"")
                     .removePrefix("'").removeSuffix("'")
-                    .replace(Regex("^(Reponse|Message)\\s*:\\s*", RegexOption.IGNORE_CASE), "")
 
                 // Limiter a 50 caracteres max
-                if (cleanResponse.length > 50) {
-                    cleanResponse = cleanResponse.substring(0, 50)
-                }
+                val cleanResponse = RESPONSE_PREFIX_REGEX.replaceFirst(unquoted, "").take(MAX_RESPONSE_LENGTH)
 
                 if (config.testModeActive) {
                     logger.info("[API] Reponse finale: \"$cleanResponse\"")
@@ -197,47 +238,13 @@ Exemple: CONFUSION - demande de clarification"""
                 logger.error("Erreur lors de la generation: ${e.message}")
                 ""
             }
-        }, executor)
-    }
-
-    /**
-     * Construit le prompt de generation selon la categorie.
-     * C'est ici que la "magie" opère - chaque categorie a un comportement different.
-     * @param conversationHistory Historique des derniers messages de la conversation
-     * @param recentResponses Les dernieres reponses envoyees (pour eviter repetitions)
-     */
-    private fun buildResponsePrompt(playerUsername: String, category: MessageCategory, conversationHistory: List<String> = emptyList(), recentResponses: List<String> = emptyList()): String {
-        // Construire le contexte d'historique
-        val historyContext = if (conversationHistory.isNotEmpty()) {
-            """
-
-HISTORIQUE RECENT DE LA CONVERSATION:
-${conversationHistory.joinToString("\n")}
-Utilise ce contexte pour repondre de facon coherente."""
-        } else {
-            ""
-        }
-
-        // Construire la liste des reponses a eviter
-        val avoidContext = if (recentResponses.isNotEmpty()) {
-            """
-
-REPONSES DEJA UTILISEES (NE PAS REPETER):
-${recentResponses.joinToString(", ")}
-Tu DOIS varier tes reponses! Utilise des synonymes ou reformule."""
-        } else {
-            ""
         }
+    }
 
-        val baseRules = """Tu es $playerUsername, un joueur Minecraft qui est occupe (en train de farmer).
-Tu dois generer une reponse TRES COURTE (1-5 mots max).
-Style: langage familier de joueur (yo, wesh, trql, dsl, nn, etc.)
-JAMAIS de ponctuation excessive. JAMAIS formel.$historyContext$avoidContext"""
-
-        return when (category) {
-            MessageCategory.GREETING -> """$baseRules
-
-CONTEXTE: C'est une SALUTATION simple.
+    // Instructions specifiques a chaque categorie (texte statique construit une seule fois)
+    // Seule la partie commune (baseRules) depend du joueur et de l'historique
+    private val CATEGORY_INSTRUCTIONS: Map<MessageCategory, String> = EnumMap<MessageCategory, String>(MessageCategory::class.java).apply {
+        put(MessageCategory.GREETING, """CONTEXTE: C'est une SALUTATION simple.
 OBJECTIF: Repondre amicalement mais brievement.
 
 Exemples de reponses:
@@ -247,11 +254,9 @@ Exemples de reponses:
 - "cc" -> "cc" ou "yo"
 - "coucou" -> "salut"
 
-Reponds UNIQUEMENT avec le message (1-2 mots)."""
+Reponds UNIQUEMENT avec le message (1-2 mots).""")
 
-            MessageCategory.GREETING_WITH_STATE -> """$baseRules
-
-CONTEXTE: C'est une salutation AVEC question sur ton etat (ca va, cv).
+        put(MessageCategory.GREETING_WITH_STATE, """CONTEXTE: C'est une salutation AVEC question sur ton etat (ca va, cv).
 OBJECTIF: Repondre positivement ET retourner la question.
 
 Exemples de reponses:
@@ -263,11 +268,9 @@ Exemples de reponses:
 - "ca farte ?" -> "oui toi" ou "tranquille toi"
 
 IMPORTANT: Tu dois TOUJOURS inclure "et toi" ou "toi" a la fin!
-Reponds UNIQUEMENT avec le message (2-4 mots)."""
-
-            MessageCategory.QUESTION_COMMERCIAL -> """$baseRules
+Reponds UNIQUEMENT avec le message (2-4 mots).""")
 
-CONTEXTE: C'est une question COMMERCIALE (achat/vente).
+        put(MessageCategory.QUESTION_COMMERCIAL, """CONTEXTE: C'est une question COMMERCIALE (achat/vente).
 OBJECTIF: REFUSER poliment. Tu n'as rien a vendre, tu ne veux rien acheter.
 
 Exemples de reponses:
@@ -276,11 +279,9 @@ Exemples de reponses:
 - "tu veux acheter du fer?" -> "nn merci"
 - "t'aurais de la stone?" -> "dsl j'en ai pas"
 
-Reponds UNIQUEMENT avec le message (2-4 mots). Toujours negatif/refus."""
-
-            MessageCategory.INVITATION -> """$baseRules
+Reponds UNIQUEMENT avec le message (2-4 mots). Toujours negatif/refus.""")
 
-CONTEXTE: C'est une INVITATION a faire quelque chose.
+        put(MessageCategory.INVITATION, """CONTEXTE: C'est une INVITATION a faire quelque chose.
 OBJECTIF: REFUSER poliment. Tu es occupe.
 
 Exemples de reponses:
@@ -289,11 +290,9 @@ Exemples de reponses:
 - "on fait un donjon?" -> "nn je peux pas la"
 - "tu viens spawn?" -> "dsl jsuis occupe la"
 
-Reponds UNIQUEMENT avec le message (2-4 mots). Toujours refuser poliment."""
+Reponds UNIQUEMENT avec le message (2-4 mots). Toujours refuser poliment.""")
 
-            MessageCategory.QUESTION_HELP -> """$baseRules
-
-CONTEXTE: C'est une DEMANDE D'AIDE explicite.
+        put(MessageCategory.QUESTION_HELP, """CONTEXTE: C'est une DEMANDE D'AIDE explicite.
 OBJECTIF: REFUSER poliment. Tu es occupe et ne peux pas aider maintenant.
 
 Exemples de reponses:
@@ -301,11 +300,9 @@ Exemples de reponses:
 - "t'as 2 sec?" -> "nn dsl pas maintenant"
 - "j'ai besoin d'aide" -> "dsl je peux pas la"
 
-Reponds UNIQUEMENT avec le message (2-4 mots). Toujours refuser poliment."""
-
-            MessageCategory.QUESTION_LOCATION -> """$baseRules
+Reponds UNIQUEMENT avec le message (2-4 mots). Toujours refuser poliment.""")
 
-CONTEXTE: Question sur ta localisation ou activite.
+        put(MessageCategory.QUESTION_LOCATION, """CONTEXTE: Question sur ta localisation ou activite.
 OBJECTIF: Repondre vaguement, tu es occupe.
 
 Exemples de reponses:
@@ -313,11 +310,9 @@ Exemples de reponses:
 - "tu fais quoi?" -> "des trucs"
 - "t'es la?" -> "oui mais occupe"
 
-Reponds UNIQUEMENT avec le message (2-3 mots). Rester vague."""
+Reponds UNIQUEMENT avec le message (2-3 mots). Rester vague.""")
 
-            MessageCategory.ACKNOWLEDGMENT -> """$baseRules
-
-CONTEXTE: C'est une CONFIRMATION/ACQUIESCEMENT (nickel, ok, d'accord, super, cool).
+        put(MessageCategory.ACKNOWLEDGMENT, """CONTEXTE: C'est une CONFIRMATION/ACQUIESCEMENT (nickel, ok, d'accord, super, cool).
 OBJECTIF: NE PAS REPONDRE ou reponse minimaliste. La conversation est terminee naturellement.
 
 Exemples de situations ou NE PAS repondre:
@@ -330,11 +325,9 @@ Si vraiment necessaire, reponse ultra-courte:
 - "nickel" -> "" (rien)
 - "ok cool" -> "" (rien)
 
-Reponds avec une chaine VIDE "" dans 90% des cas. La conversation est finie."""
-
-            MessageCategory.CONFUSION -> """$baseRules
+Reponds avec une chaine VIDE "" dans 90% des cas. La conversation est finie.""")
 
-CONTEXTE: La personne est CONFUSE par quelque chose que tu as dit (?, hein, quoi).
+        put(MessageCategory.CONFUSION, """CONTEXTE: La personne est CONFUSE par quelque chose que tu as dit (?, hein, quoi).
 OBJECTIF: Clarifier brevement ou s'excuser pour la confusion.
 
 Exemples de reponses:
@@ -343,11 +336,46 @@ Exemples de reponses:
 - "quoi" -> "nan laisse" ou "rien dsl"
 - "??" -> "tkt laisse" ou "oublie"
 
-Reponds UNIQUEMENT avec le message (2-3 mots). Desamorcer la confusion."""
+Reponds UNIQUEMENT avec le message (2-3 mots). Desamorcer la confusion.""")
+
+        put(MessageCategory.IGNORE, "Ne reponds pas, ce message n'est pas pour toi.")
+    }
+
+    /**
+     * Construit le prompt de generation selon la categorie.
+     * C'est ici que la "magie" opère - chaque categorie a un comportement different.
+     * @param conversationHistory Historique des derniers messages de la conversation
+     * @param recentResponses Les dernieres reponses envoyees (pour eviter repetitions)
+     */
+    private fun buildResponsePrompt(playerUsername: String, category: MessageCategory, conversationHistory: List<String> = emptyList(), recentResponses: List<String> = emptyList()): String {
+        // Construire le contexte d'historique
+        val historyContext = if (conversationHistory.isNotEmpty()) {
+            """
 
-            MessageCategory.IGNORE -> """$baseRules
-Ne reponds pas, ce message n'est pas pour toi."""
+HISTORIQUE RECENT DE LA CONVERSATION:
+${conversationHistory.joinToString("\n")}
+Utilise ce contexte pour repondre de facon coherente."""
+        } else {
+            ""
         }
+
+        // Construire la liste des reponses a eviter
+        val avoidContext = if (recentResponses.isNotEmpty()) {
+            """
+
+REPONSES DEJA UTILISEES (NE PAS REPETER):
+${recentResponses.joinToString(", ")}
+Tu DOIS varier tes reponses! Utilise des synonymes ou reformule."""
+        } else {
+            ""
+        }
+
+        val baseRules = """Tu es $playerUsername, un joueur Minecraft qui est occupe (en train de farmer).
+Tu dois generer une reponse TRES COURTE (1-5 mots max).
+Style: langage familier de joueur (yo, wesh, trql, dsl, nn, etc.)
+JAMAIS de ponctuation excessive. JAMAIS formel.$historyContext$avoidContext"""
+
+        return "$baseRules\n\n${CATEGORY_INSTRUCTIONS.getValue(category)}"
     }
 
     /**
@@ -370,10 +398,30 @@ Ne reponds pas, ce message n'est pas pour toi."""
 
     /**
      * Appelle l'API Mistral avec un prompt systeme et utilisateur.
+     * Retente automatiquement sur les erreurs transitoires (429 / 5xx).
      */
     private fun callMistralApi(apiKey: String, systemPrompt: String, userPrompt: String): String {
-        val url = URI(API_URL).toURL()
-        val connection = url.openConnection() as HttpURLConnection
+        var attempt = 0
+        while (true) {
+            try {
+                return executeMistralRequest(apiKey, systemPrompt, userPrompt)
+            } catch (e: RetryableApiException) {
+                attempt++
+                if (attempt > MAX_API_RETRIES) throw e
+                logger.warn("Erreur API Mistral transitoire (${e.responseCode}) - nouvelle tentative $attempt/$MAX_API_RETRIES")
+                Thread.sleep(API_RETRY_DELAY_MS * attempt)
+            }
+        }
+    }
+
+    /**
+     * Execute une requete HTTP vers l'API Mistral.
+     * La connexion n'est pas fermee explicitement en cas de succes: une fois les flux
+     * lus et fermes, le socket TLS retourne dans le cache keep-alive du JDK et est
+     * reutilise par l'appel suivant (evite un handshake TCP+TLS par reponse).
+     */
+    private fun executeMistralRequest(apiKey: String, systemPrompt: String, userPrompt: String): String {
+        val connection = apiUrl.openConnection() as HttpURLConnection
 
         try {
             connection.requestMethod = "POST"
@@ -385,7 +433,7 @@ Ne reponds pas, ce message n'est pas pour toi."""
 
             val requestBody = JsonObject().apply {
                 addProperty("model", MODEL)
-                add("messages", com.google.gson.JsonArray().apply {
+                add("messages", JsonArray().apply {
                     add(JsonObject().apply {
                         addProperty("role", "system")
                         addProperty("content", systemPrompt)
@@ -399,19 +447,26 @@ Ne reponds pas, ce message n'est pas pour toi."""
                 addProperty("max_tokens", 100)
             }
 
-            connection.outputStream.use { os ->
-                os.write(gson.toJson(requestBody).toByteArray())
+            // Serialisation directe dans le flux (pas de String/ByteArray intermediaire)
+            connection.outputStream.bufferedWriter(Charsets.UTF_8).use { writer ->
+                gson.toJson(requestBody, writer)
             }
 
             val responseCode = connection.responseCode
             if (responseCode != 200) {
+                // Lire entierement le corps d'erreur pour que la connexion reste reutilisable
                 val errorBody = connection.errorStream?.use { it.bufferedReader().readText() } ?: "No error body"
                 logger.error("Erreur API Mistral ($responseCode): $errorBody")
+                if (responseCode == 429 || responseCode >= 500) {
+                    throw RetryableApiException(responseCode)
+                }
                 throw RuntimeException("Erreur API: $responseCode")
             }
 
-            val responseBody = connection.inputStream.use { it.bufferedReader().readText() }
-            val jsonResponse = JsonParser.parseString(responseBody).asJsonObject
+            // Parse directement depuis le flux au lieu de lire tout le corps en String
+            val jsonResponse = connection.inputStream.bufferedReader(Charsets.UTF_8).use {
+                JsonParser.parseReader(it).asJsonObject
+            }
 
             return jsonResponse
                 .getAsJsonArray("choices")
@@ -420,8 +475,15 @@ Ne reponds pas, ce message n'est pas pour toi."""
                 .get("content").asString
                 .trim()
 
-        } finally {
+        } catch (e: IOException) {
+            // Erreur reseau: liberer le socket (il ne doit pas etre remis dans le cache)
             connection.disconnect()
+            throw e
         }
     }
+
+    /**
+     * Erreur HTTP transitoire pouvant etre retentee.
+     */
+    private class RetryableApiException(val responseCode: Int) : RuntimeException("Erreur API: $responseCode")
 }
@@ -5,6 +5,11 @@ import com.google.gson.GsonBuilder
 import net.fabricmc.loader.api.FabricLoader
 import org.slf4j.LoggerFactory
 import java.io.File
+import java.time.Duration
+import java.time.Instant
+import java.time.LocalDateTime
+import java.time.LocalTime
+import java.time.ZoneId
 
 /**
  * Configuration principale du bot agricole.
@@ -65,6 +70,10 @@ data class AgriConfig(
     var delayBetweenBuckets: Int = 3000,
     var delayAfterCommand: Int = 2000,
 
+    // Vidage rapide des seaux restants en fin de session (1s entre chaque seau au lieu de 4s)
+    // A desactiver si le serveur lag et ne compte pas tous les seaux
+    var fastBucketEmptying: Boolean = false,
+
     // Touches (codes GLFW)
     var keyToggleBot: Int = 294,       // F5 par defaut
     var keyFillBuckets: Int = 296,     // F7 par defaut (execute /eau)
@@ -100,6 +109,9 @@ data class AgriConfig(
         private val gson: Gson = GsonBuilder().setPrettyPrinting().create()
         private var instance: AgriConfig? = null
 
+        // Dernier contenu ecrit sur disque (permet d'ignorer les sauvegardes sans changement)
+        private var lastSavedJson: String? = null
+
         // Version du schema de configuration (incrementer lors de changements incompatibles)
         const val CONFIG_VERSION = 1
 
@@ -113,6 +125,26 @@ data class AgriConfig(
         // Seuil de fusion des sessions (si prochaine session dans moins de X minutes, faire maintenant)
         const val SESSION_MERGE_THRESHOLD_MINUTES = 60 // 1 heure
 
+        // Plages horaires (en minutes depuis minuit)
+        private const val MORNING_START_MINUTES = 390  // 6h30
+        private const val MORNING_END_MINUTES = 690    // 11h30
+        private const val RESTART_START_MINUTES = 340  // 5h40
+        private const val RESTART_END_MINUTES = 400    // 6h40
+
+        // Heures du redemarrage serveur (creees une seule fois au lieu de a chaque calcul)
+        private val RESTART_START_TIME: LocalTime = LocalTime.of(5, 40)
+        private val RESTART_END_TIME: LocalTime = LocalTime.of(6, 40)
+        // Heure de reprise apres redemarrage (fin de pause visee)
+        private val RESTART_RESUME_TIME: LocalTime = LocalTime.of(6, 30)
+
+        /**
+         * Retourne l'heure actuelle en minutes depuis minuit.
+         */
+        private fun currentMinuteOfDay(): Int {
+            val now = LocalTime.now()
+            return now.hour * 60 + now.minute
+        }
+
         // Durees d'eau disponibles (en minutes)
         val WATER_DURATIONS = listOf(
             300,  // 5h
@@ -152,16 +184,19 @@ data class AgriConfig(
             }
         }
 
-        private fun getConfigFile(): File {
-            val configDir = FabricLoader.getInstance().configDir.toFile()
-            return File(configDir, "agribot.json")
+        // Chemins resolus une seule fois: le dossier config ne change pas pendant l'execution
+        private val configFile: File by lazy {
+            File(FabricLoader.getInstance().configDir.toFile(), "agribot.json")
         }
 
-        private fun getBackupFile(): File {
-            val configDir = FabricLoader.getInstance().configDir.toFile()
-            return File(configDir, "agribot.json.backup")
+        private val backupFile: File by lazy {
+            File(FabricLoader.getInstance().configDir.toFile(), "agribot.json.backup")
         }
 
+        private fun getConfigFile(): File = configFile
+
+        private fun getBackupFile(): File = backupFile
+
         /**
          * Cree une sauvegarde du fichier de configuration actuel.
          */
@@ -186,8 +221,7 @@ data class AgriConfig(
             try {
                 val backupFile = getBackupFile()
                 if (backupFile.exists()) {
-                    val json = backupFile.readText()
-                    val config = gson.fromJson(json, AgriConfig::class.java)
+                    val config = backupFile.bufferedReader().use { gson.fromJson(it, AgriConfig::class.java) }
                     if (config.validate()) {
                         logger.info("Configuration restauree depuis le backup")
                         return config
@@ -209,8 +243,8 @@ data class AgriConfig(
 
             if (file.exists()) {
                 try {
-                    val json = file.readText()
-                    val loadedConfig = gson.fromJson(json, AgriConfig::class.java)
+                    // Lecture en flux: Gson parse directement depuis le fichier (pas de String intermediaire)
+                    val loadedConfig = file.bufferedReader().use { gson.fromJson(it, AgriConfig::class.java) }
 
                     // Valider la configuration chargee
                     if (loadedConfig != null && loadedConfig.validate()) {
@@ -255,14 +289,27 @@ data class AgriConfig(
     fun save() {
         try {
             val file = getConfigFile()
-            file.parentFile?.mkdirs()
+            val json = gson.toJson(this)
 
-            // Creer un backup avant de sauvegarder (si le fichier existe deja)
-            if (file.exists()) {
+            // Un seul stat() du fichier par sauvegarde, reutilise pour toutes les decisions
+            val fileExists = file.exists()
+
+            // Rien n'a change depuis la derniere ecriture: eviter backup + reecriture
+            if (json == lastSavedJson && fileExists) {
+                logger.debug("Configuration inchangee, sauvegarde ignoree")
+                return
+            }
+
+            if (fileExists) {
+                // Creer un backup avant de sauvegarder
                 Companion.createBackup()
+            } else {
+                // Le dossier n'est a creer que si le fichier n'existe pas encore
+                file.parentFile?.mkdirs()
             }
 
-            file.writeText(gson.toJson(this))
+            ConfigFileWriter.writeAtomically(file, json)
+            lastSavedJson = json
             logger.info("Configuration sauvegardee dans ${file.absolutePath}")
         } catch (e: Exception) {
             logger.error("Erreur lors de la sauvegarde de la config: ${e.message}")
@@ -385,7 +432,8 @@ data class AgriConfig(
      * Recupere le nombre de stations actives.
      */
     fun getActiveStationCount(): Int {
-        return getActiveStations().size
+        // Compte sans construire la liste filtree (appele par le HUD)
+        return stations.count { it.isNotBlank() }
     }
 
     /**
@@ -419,23 +467,19 @@ data class AgriConfig(
      * Reste du temps: 16 seaux
      */
     fun getBucketCount(): Int {
-        val now = java.time.LocalTime.now()
-        val timeInMinutes = now.hour * 60 + now.minute
-
-        // 6h30 = 390 min, 11h30 = 690 min
-        return if (timeInMinutes in 390..690) 1 else 16
+        val timeInMinutes = currentMinuteOfDay()
+        return if (timeInMinutes in MORNING_START_MINUTES..MORNING_END_MINUTES) 1 else 16
     }
 
     /**
      * Determine le mode de gestion des seaux selon l'heure.
      */
     fun getBucketMode(): String {
-        val now = java.time.LocalTime.now()
-        val timeInMinutes = now.hour * 60 + now.minute
+        val timeInMinutes = currentMinuteOfDay()
 
         return when {
-            timeInMinutes in 390..690 -> "drop"      // 6h30-11h30: jeter les seaux
-            timeInMinutes > 690 -> "retrieve"        // Apres 11h30: recuperer
+            timeInMinutes in MORNING_START_MINUTES..MORNING_END_MINUTES -> "drop"  // 6h30-11h30: jeter les seaux
+            timeInMinutes > MORNING_END_MINUTES -> "retrieve"                      // Apres 11h30: recuperer
             else -> "normal"
         }
     }
@@ -445,11 +489,11 @@ data class AgriConfig(
      * Format: "YYYY-MM-DD-matin" ou "YYYY-MM-DD-aprem"
      */
     fun getCurrentPeriod(): String {
-        val now = java.time.LocalDateTime.now()
+        val now = LocalDateTime.now()
         val date = now.toLocalDate().toString()
         val timeInMinutes = now.hour * 60 + now.minute
 
-        return if (timeInMinutes in 390..690) {
+        return if (timeInMinutes in MORNING_START_MINUTES..MORNING_END_MINUTES) {
             "$date-matin"  // 6h30-11h30
         } else {
             "$date-aprem"  // Apres 11h30 ou avant 6h30
@@ -460,11 +504,7 @@ data class AgriConfig(
      * Verifie si on est dans la periode de redemarrage serveur (5h40-6h40).
      */
     fun isServerRestartPeriod(): Boolean {
-        val now = java.time.LocalTime.now()
-        val timeInMinutes = now.hour * 60 + now.minute
-
-        // 5h40 = 340 min, 6h40 = 400 min
-        return timeInMinutes in 340..400
+        return currentMinuteOfDay() in RESTART_START_MINUTES..RESTART_END_MINUTES
     }
 
     /**
@@ -472,15 +512,15 @@ data class AgriConfig(
      * @return Temps en ms jusqu'a 6h30, ou 0 si on est deja apres 6h30
      */
     fun getTimeUntilRestartEnd(): Long {
-        val now = java.time.LocalDateTime.now()
+        val now = LocalDateTime.now()
         val today = now.toLocalDate()
 
         // Fin de la periode de redemarrage = 6h30
-        val restartEnd = java.time.LocalDateTime.of(today, java.time.LocalTime.of(6, 30))
+        val restartEnd = LocalDateTime.of(today, RESTART_RESUME_TIME)
 
         // Si on est avant 6h30 aujourd'hui
         return if (now.isBefore(restartEnd)) {
-            java.time.Duration.between(now, restartEnd).toMillis()
+            Duration.between(now, restartEnd).toMillis()
         } else {
             0L
         }
@@ -494,7 +534,7 @@ data class AgriConfig(
      * @param periodEnd Fin de la periode
      * @return Duree du chevauchement en secondes
      */
-    private fun calculateRestartOverlap(periodStart: java.time.LocalDateTime, periodEnd: java.time.LocalDateTime): Int {
+    private fun calculateRestartOverlap(periodStart: LocalDateTime, periodEnd: LocalDateTime): Int {
         if (periodEnd.isBefore(periodStart) || periodStart == periodEnd) {
             return 0
         }
@@ -504,14 +544,14 @@ data class AgriConfig(
         val endDate = periodEnd.toLocalDate()
 
         while (!currentDate.isAfter(endDate)) {
-            val restartStart = java.time.LocalDateTime.of(currentDate, java.time.LocalTime.of(5, 40))
-            val restartEnd = java.time.LocalDateTime.of(currentDate, java.time.LocalTime.of(6, 40))
+            val restartStart = LocalDateTime.of(currentDate, RESTART_START_TIME)
+            val restartEnd = LocalDateTime.of(currentDate, RESTART_END_TIME)
 
             val overlapStart = maxOf(periodStart, restartStart)
             val overlapEnd = minOf(periodEnd, restartEnd)
 
             if (overlapStart.isBefore(overlapEnd)) {
-                totalOverlap += java.time.Duration.between(overlapStart, overlapEnd).seconds.toInt()
+                totalOverlap += Duration.between(overlapStart, overlapEnd).seconds.toInt()
             }
 
             currentDate = currentDate.plusDays(1)
@@ -529,14 +569,14 @@ data class AgriConfig(
      * @return Temps restant ajuste en secondes jusqu'a la fin de croissance
      */
     fun calculateAdjustedRemainingGrowthTime(cycleStartTimeMs: Long, baseGrowthTimeSeconds: Int): Int {
-        val zoneId = java.time.ZoneId.systemDefault()
-        val cycleStart = java.time.LocalDateTime.ofInstant(
-            java.time.Instant.ofEpochMilli(cycleStartTimeMs), zoneId
+        val zoneId = ZoneId.systemDefault()
+        val cycleStart = LocalDateTime.ofInstant(
+            Instant.ofEpochMilli(cycleStartTimeMs), zoneId
         )
-        val now = java.time.LocalDateTime.now()
+        val now = LocalDateTime.now()
 
         // Temps ecoule depuis le debut du cycle
-        val elapsedSeconds = java.time.Duration.between(cycleStart, now).seconds.toInt()
+        val elapsedSeconds = Duration.between(cycleStart, now).seconds.toInt()
 
         // Temps de redemarrage passe pendant cette periode (les plantes n'ont pas pousse)
         val pastRestartTime = calculateRestartOverlap(cycleStart, now)
@@ -573,7 +613,7 @@ data class AgriConfig(
      * @return Duree de pause ajustee en secondes
      */
     fun adjustPauseForServerRestart(pauseSeconds: Int): Int {
-        val now = java.time.LocalDateTime.now()
+        val now = LocalDateTime.now()
         val pauseEnd = now.plusSeconds(pauseSeconds.toLong())
 
         val pauseEndHour = pauseEnd.hour
@@ -582,12 +622,12 @@ data class AgriConfig(
 
         // Periode de redemarrage: 5h40 (340 min) a 6h40 (400 min)
         // On veut eviter cette periode, donc on etend jusqu'a 6h30 (390 min)
-        if (pauseEndTimeInMinutes in 340..400) {
+        if (pauseEndTimeInMinutes in RESTART_START_MINUTES..RESTART_END_MINUTES) {
             // La fin de pause tombe pendant le redemarrage
             val today = pauseEnd.toLocalDate()
-            val restartEnd = java.time.LocalDateTime.of(today, java.time.LocalTime.of(6, 30))
+            val restartEnd = LocalDateTime.of(today, RESTART_RESUME_TIME)
 
-            val adjustedPauseMs = java.time.Duration.between(now, restartEnd).toMillis()
+            val adjustedPauseMs = Duration.between(now, restartEnd).toMillis()
             val adjustedPauseSeconds = (adjustedPauseMs / 1000).toInt()
 
             val originalMinutes = pauseSeconds / 60
@@ -33,11 +33,16 @@ data class AutoResponseConfig(
         private val gson: Gson = GsonBuilder().setPrettyPrinting().create()
         private var instance: AutoResponseConfig? = null
 
-        private fun getConfigFile(): File {
-            val configDir = FabricLoader.getInstance().configDir.toFile()
-            return File(configDir, "agribot_autoresponse.json")
+        // Dernier contenu ecrit sur disque (l'ecran sauvegarde apres setTestMode qui sauvegarde deja)
+        private var lastSavedJson: String? = null
+
+        // Resolu au premier acces puis reutilise pour chaque load/save
+        private val configFile: File by lazy {
+            File(FabricLoader.getInstance().configDir.toFile(), "agribot_autoresponse.json")
         }
 
+        private fun getConfigFile(): File = configFile
+
         /**
          * Charge la configuration depuis le fichier.
          */
@@ -46,8 +51,8 @@ data class AutoResponseConfig(
 
             if (file.exists()) {
                 try {
-                    val json = file.readText()
-                    val loadedConfig = gson.fromJson(json, AutoResponseConfig::class.java)
+                    // Parse en flux depuis le fichier
+                    val loadedConfig = file.bufferedReader().use { gson.fromJson(it, AutoResponseConfig::class.java) }
 
                     if (loadedConfig != null) {
                         instance = loadedConfig
@@ -85,8 +90,20 @@ data class AutoResponseConfig(
     fun save() {
         try {
             val file = getConfigFile()
-            file.parentFile?.mkdirs()
-            file.writeText(gson.toJson(this))
+            val json = gson.toJson(this)
+            val fileExists = file.exists()
+
+            if (json == lastSavedJson && fileExists) {
+                logger.debug("Configuration auto-reponse inchangee, sauvegarde ignoree")
+                return
+            }
+
+            // Le dossier n'est a creer que si le fichier n'existe pas encore
+            if (!fileExists) {
+                file.parentFile?.mkdirs()
+            }
+            ConfigFileWriter.writeAtomically(file, json)
+            lastSavedJson = json
             logger.info("Configuration auto-reponse sauvegardee dans ${file.absolutePath}")
         } catch (e: Exception) {
             logger.error("Erreur lors de la sauvegarde de la config auto-reponse: ${e.message}")
@@ -0,0 +1,33 @@
+package fr.nix.agribot.config
+
+import java.io.File
+import java.nio.file.AtomicMoveNotSupportedException
+import java.nio.file.Files
+import java.nio.file.StandardCopyOption
+
+/**
+ * Ecriture des fichiers de configuration.
+ */
+internal object ConfigFileWriter {
+
+    /**
+     * Ecrit le contenu dans un fichier temporaire puis le renomme sur le fichier final.
+     * Un crash pendant l'ecriture laisse l'ancien fichier intact au lieu d'un JSON tronque.
+     */
+    fun writeAtomically(file: File, content: String) {
+        val tmpFile = File(file.parentFile, "${file.name}.tmp")
+        tmpFile.writeText(content)
+
+        try {
+            Files.move(
+                tmpFile.toPath(),
+                file.toPath(),
+                StandardCopyOption.REPLACE_EXISTING,
+                StandardCopyOption.ATOMIC_MOVE
+            )
+        } catch (e: AtomicMoveNotSupportedException) {
+            // Systeme de fichiers sans renommage atomique: remplacement simple
+            Files.move(tmpFile.toPath(), file.toPath(), StandardCopyOption.REPLACE_EXISTING)
+        }
+    }
+}
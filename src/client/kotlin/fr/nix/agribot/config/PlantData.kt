@@ -20,9 +20,9 @@ data class PlantData(
      * Determine le type de clic pour la recolte.
      * - Plantes a 1 fruit (tempsFruit == 0) -> clic gauche
      * - Plantes avec tige + fruits (tempsFruit > 0) -> clic droit
+     * Calcule une fois a la creation (les donnees d'une plante sont immuables).
      */
-    val harvestClickType: ClickType
-        get() = if (tempsFruit > 0) ClickType.RIGHT else ClickType.LEFT
+    val harvestClickType: ClickType = if (tempsFruit > 0) ClickType.RIGHT else ClickType.LEFT
 
     /**
      * Calcule le temps total de croissance en minutes avec le boost applique.
@@ -104,10 +104,13 @@ object Plants {
      */
     fun get(name: String): PlantData? = plants[name]
 
+    // Le registre est immuable: le tri des noms est fait une seule fois
+    private val sortedNames: List<String> = plants.keys.sorted()
+
     /**
      * Recupere la liste des noms de plantes triee.
      */
-    fun getNames(): List<String> = plants.keys.sorted()
+    fun getNames(): List<String> = sortedNames
 
     /**
      * Verifie si une plante existe.
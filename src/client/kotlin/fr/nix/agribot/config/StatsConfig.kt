@@ -28,6 +28,12 @@ data class StatsConfig(
     // Statistiques par plante (nom de la plante -> stats)
     val plantStats: MutableMap<String, PlantStats> = mutableMapOf()
 ) {
+    // Compteur de modifications (non sauvegarde): l'ecran de statistiques ne recalcule
+    // ses lignes que lorsqu'il change
+    @Transient
+    var revision: Int = 0
+        private set
+
     /**
      * Statistiques par type de plante.
      */
@@ -44,16 +50,21 @@ data class StatsConfig(
         private val gson: Gson = GsonBuilder().setPrettyPrinting().create()
         private var instance: StatsConfig? = null
 
-        private fun getConfigFile(): File {
-            val configDir = FabricLoader.getInstance().configDir.toFile()
-            return File(configDir, "agribot_stats.json")
+        // Dernier JSON ecrit: une sauvegarde sans modification depuis est ignoree
+        private var lastSavedJson: String? = null
+
+        private val statsFile: File by lazy {
+            File(FabricLoader.getInstance().configDir.toFile(), "agribot_stats.json")
         }
 
-        private fun getBackupFile(): File {
-            val configDir = FabricLoader.getInstance().configDir.toFile()
-            return File(configDir, "agribot_stats.json.backup")
+        private val statsBackupFile: File by lazy {
+            File(FabricLoader.getInstance().configDir.toFile(), "agribot_stats.json.backup")
         }
 
+        private fun getConfigFile(): File = statsFile
+
+        private fun getBackupFile(): File = statsBackupFile
+
         /**
          * Cree une sauvegarde du fichier de statistiques actuel.
          */
@@ -77,8 +88,7 @@ data class StatsConfig(
             try {
                 val backupFile = getBackupFile()
                 if (backupFile.exists()) {
-                    val json = backupFile.readText()
-                    val config = gson.fromJson(json, StatsConfig::class.java)
+                    val config = backupFile.bufferedReader().use { gson.fromJson(it, StatsConfig::class.java) }
                     if (config != null) {
                         logger.info("Statistiques restaurees depuis le backup")
                         return config
@@ -98,8 +108,8 @@ data class StatsConfig(
 
             if (file.exists()) {
                 try {
-                    val json = file.readText()
-                    val loadedConfig = gson.fromJson(json, StatsConfig::class.java)
+                    // Gson lit directement le fichier (pas de copie complete en String)
+                    val loadedConfig = file.bufferedReader().use { gson.fromJson(it, StatsConfig::class.java) }
 
                     if (loadedConfig != null) {
                         instance = loadedConfig
@@ -152,13 +162,23 @@ data class StatsConfig(
     fun save() {
         try {
             val file = getConfigFile()
-            file.parentFile?.mkdirs()
+            val json = gson.toJson(this)
 
-            if (file.exists()) {
+            val fileExists = file.exists()
+
+            if (json == lastSavedJson && fileExists) {
+                logger.debug("Statistiques inchangees, sauvegarde ignoree")
+                return
+            }
+
+            if (fileExists) {
                 Companion.createBackup()
+            } else {
+                file.parentFile?.mkdirs()
             }
 
-            file.writeText(gson.toJson(this))
+            ConfigFileWriter.writeAtomically(file, json)
+            lastSavedJson = json
             logger.info("Statistiques sauvegardees dans ${file.absolutePath}")
         } catch (e: Exception) {
             logger.error("Erreur lors de la sauvegarde des statistiques: ${e.message}")
@@ -180,6 +200,7 @@ data class StatsConfig(
         val sessionProfit = sessionRevenue - sessionCost
 
         // Mettre a jour les totaux
+        revision++
         totalSessions++
         totalStationsCompleted += stationCount
         totalRevenue += sessionRevenue
@@ -212,6 +233,7 @@ data class StatsConfig(
         val stationProfit = stationRevenue - stationCost
 
         // Mettre a jour les totaux
+        revision++
         totalStationsCompleted++
         totalRevenue += stationRevenue
         totalCost += stationCost
@@ -234,6 +256,7 @@ data class StatsConfig(
      * @param plantName Nom de la plante cultivee
      */
     fun incrementSessionCount(plantName: String) {
+        revision++
         totalSessions++
         val plantStat = plantStats.getOrPut(plantName) { PlantStats() }
         plantStat.sessions++
@@ -245,6 +268,7 @@ data class StatsConfig(
      * Remet toutes les statistiques a zero.
      */
     fun reset() {
+        revision++
         totalSessions = 0
         totalStationsCompleted = 0
         totalRevenue = 0.0
@@ -36,11 +36,21 @@ class ConfigScreen(private val parent: Screen? = null) : Screen(Text.literal("Ag
     private val fieldHeight = 22
     private val fieldSpacing = 24
     private var stationsStartY = 143  // Position Y de départ des stations (calculée dans init)
+    private var displayedStations: IntRange = IntRange.EMPTY  // Index des champs de station actuellement affiches
     private var selectedWaterDurationIndex = 0
     private var selectedPlantIndex = 0
     private val plantNames = Plants.getNames()
     private var isBotActive = false  // True si le bot est actif (empeche le changement de plante)
 
+    // Temps de croissance affiche, recalcule seulement quand la plante ou le boost change
+    // (et non a chaque frame)
+    private var growthTimeText: String? = null
+    private var growthTimePlantIndex = -1
+    private var growthTimeBoostText: String? = null
+
+    // Texte "Stations actives", invalide par les champs de station quand leur contenu change
+    private var activeStationsText: String? = null
+
     override fun init() {
         super.init()
 
@@ -138,6 +148,7 @@ class ConfigScreen(private val parent: Screen? = null) : Screen(Text.literal("Ag
         // === Section Stations (scrollable) ===
         stationsStartY = waterY + 35
         stationFields.clear()
+        activeStationsText = null
 
         // Calculer le nombre de stations visibles en fonction de l'espace disponible
         val bottomMargin = 60  // Espace pour "Stations actives" (height-50) et boutons (height-30)
@@ -156,10 +167,12 @@ class ConfigScreen(private val parent: Screen? = null) : Screen(Text.literal("Ag
             )
             field.text = config.stations.getOrElse(i) { "" }
             field.setMaxLength(30)
+            field.setChangedListener { activeStationsText = null }
             stationFields.add(field)
         }
 
-        // Ajouter seulement les champs visibles
+        // Ajouter seulement les champs visibles (les enfants de l'ecran viennent d'etre recrees)
+        displayedStations = IntRange.EMPTY
         updateVisibleFields()
 
         // === Boutons ===
@@ -227,18 +240,33 @@ class ConfigScreen(private val parent: Screen? = null) : Screen(Text.literal("Ag
     }
 
     private fun updateVisibleFields() {
-        // Retirer tous les champs de station
-        stationFields.forEach { remove(it) }
+        val visibleRange = scrollOffset until minOf(30, scrollOffset + visibleStations)
 
-        // Ajouter seulement les champs visibles selon le scroll
-        for (i in 0 until visibleStations) {
-            val stationIndex = scrollOffset + i
-            if (stationIndex < 30) {
-                val field = stationFields[stationIndex]
-                field.y = stationsStartY + (i * fieldSpacing)
-                addDrawableChild(field)
+        // Scroll sans effet (deja en haut ou en bas de la liste): rien a reconstruire
+        if (visibleRange == displayedStations) return
+
+        // Retirer uniquement les champs qui sortent de la zone visible
+        for (stationIndex in displayedStations) {
+            if (stationIndex !in visibleRange) remove(stationFields[stationIndex])
+        }
+
+        // Scroll vers le bas: les champs conserves restent en place, on ajoute les nouveaux a la suite.
+        // Scroll vers le haut: les nouveaux champs doivent preceder les autres (navigation Tab), on reajoute tout.
+        val firstToAdd = if (visibleRange.first < displayedStations.first) {
+            for (stationIndex in displayedStations) {
+                if (stationIndex in visibleRange) remove(stationFields[stationIndex])
             }
+            visibleRange.first
+        } else {
+            maxOf(displayedStations.last + 1, visibleRange.first)
+        }
+
+        for (stationIndex in visibleRange) {
+            val field = stationFields[stationIndex]
+            field.y = stationsStartY + ((stationIndex - scrollOffset) * fieldSpacing)
+            if (stationIndex >= firstToAdd) addDrawableChild(field)
         }
+        displayedStations = visibleRange
     }
 
     override fun renderBackground(context: DrawContext, mouseX: Int, mouseY: Int, delta: Float) {
@@ -274,12 +302,8 @@ class ConfigScreen(private val parent: Screen? = null) : Screen(Text.literal("Ag
         context.drawTextWithShadow(textRenderer, selectedPlant, plantNameX, 55, 0xFFFFFF)
 
         // Afficher le temps de croissance calcule
-        val plantData = Plants.get(selectedPlant)
-        val boost = boostField.text.toFloatOrNull() ?: 0f
-        if (plantData != null) {
-            val temps = plantData.tempsTotalCroissance(boost)
-            val tempsStr = Plants.formatTemps(temps)
-            context.drawTextWithShadow(textRenderer, "= $tempsStr", centerX + 80, 55, 0x55FF55)
+        getGrowthTimeText()?.let { growthTime ->
+            context.drawTextWithShadow(textRenderer, growthTime, centerX + 80, 55, 0x55FF55)
         }
 
         // Label section Coffre
@@ -310,12 +334,29 @@ class ConfigScreen(private val parent: Screen? = null) : Screen(Text.literal("Ag
         }
 
         // Info en bas
-        val activeCount = stationFields.count { it.text.isNotBlank() }
-        context.drawCenteredTextWithShadow(textRenderer, "Stations actives: $activeCount/30", centerX, height - 50, 0x888888)
+        val activeText = activeStationsText
+            ?: "Stations actives: ${stationFields.count { it.text.isNotBlank() }}/30".also { activeStationsText = it }
+        context.drawCenteredTextWithShadow(textRenderer, activeText, centerX, height - 50, 0x888888)
 
         super.render(context, mouseX, mouseY, delta)
     }
 
+    /**
+     * Texte du temps de croissance pour la plante et le boost saisis.
+     * @return null si la plante n'a pas de donnees de croissance
+     */
+    private fun getGrowthTimeText(): String? {
+        val boostText = boostField.text
+        if (selectedPlantIndex != growthTimePlantIndex || boostText != growthTimeBoostText) {
+            val plantData = Plants.get(plantNames[selectedPlantIndex])
+            val boost = boostText.toFloatOrNull() ?: 0f
+            growthTimeText = plantData?.let { "= ${Plants.formatTemps(it.tempsTotalCroissance(boost))}" }
+            growthTimePlantIndex = selectedPlantIndex
+            growthTimeBoostText = boostText
+        }
+        return growthTimeText
+    }
+
     override fun mouseScrolled(mouseX: Double, mouseY: Double, horizontalAmount: Double, verticalAmount: Double): Boolean {
         // Scroll pour les stations
         val newOffset = scrollOffset - verticalAmount.toInt()
@@ -19,6 +19,12 @@ class StatsScreen(private val parent: Screen?) : Screen(Text.literal("AgriBot -
     private var maxScrollOffset = 0
     private val lineHeight = 12
 
+    // Historique par plante deja trie et formate (texte, couleur): recalcule uniquement
+    // quand les statistiques changent, pas a chaque frame
+    private var plantHistoryLines: List<Pair<String, Int>> = emptyList()
+    private var plantHistoryStats: StatsConfig? = null
+    private var plantHistoryRevision = -1
+
     override fun init() {
         super.init()
 
@@ -166,14 +172,8 @@ class StatsScreen(private val parent: Screen?) : Screen(Text.literal("AgriBot -
             }
             currentY += lineHeight + 4
 
-            // Trier par profit decroissant
-            val sortedPlants = stats.plantStats.entries.sortedByDescending { it.value.profit }
-
-            for ((plantName, pStats) in sortedPlants) {
+            for ((line, profitColor) in getPlantHistoryLines(stats)) {
                 if (currentY > 15 && currentY < height - 60) {
-                    val profitColor = if (pStats.profit >= 0) 0x55FF55 else 0xFF5555
-                    // Format: Plante Xs/Yst / profit $
-                    val line = "$plantName ${pStats.sessions}s/${pStats.stations}st / ${stats.formatNumber(pStats.profit)} $"
                     context.drawTextWithShadow(textRenderer, line, centerX - 100, currentY, profitColor)
                 }
                 currentY += lineHeight + 2
@@ -197,6 +197,24 @@ class StatsScreen(private val parent: Screen?) : Screen(Text.literal("AgriBot -
         super.render(context, mouseX, mouseY, delta)
     }
 
+    /**
+     * Retourne les lignes de l'historique par plante, triees par profit decroissant.
+     */
+    private fun getPlantHistoryLines(stats: StatsConfig): List<Pair<String, Int>> {
+        if (stats !== plantHistoryStats || stats.revision != plantHistoryRevision) {
+            plantHistoryLines = stats.plantStats.entries
+                .sortedByDescending { it.value.profit }
+                .map { (plantName, pStats) ->
+                    val profitColor = if (pStats.profit >= 0) 0x55FF55 else 0xFF5555
+                    // Format: Plante Xs/Yst / profit $
+                    "$plantName ${pStats.sessions}s/${pStats.stations}st / ${stats.formatNumber(pStats.profit)} $" to profitColor
+                }
+            plantHistoryStats = stats
+            plantHistoryRevision = stats.revision
+        }
+        return plantHistoryLines
+    }
+
     override fun mouseScrolled(mouseX: Double, mouseY: Double, horizontalAmount: Double, verticalAmount: Double): Boolean {
         val newOffset = scrollOffset - verticalAmount.toInt()
         scrollOffset = newOffset.coerceIn(0, maxScrollOffset)
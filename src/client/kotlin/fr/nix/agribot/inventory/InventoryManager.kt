@@ -2,6 +2,7 @@ package fr.nix.agribot.inventory
 
 import fr.nix.agribot.config.AgriConfig
 import net.minecraft.client.MinecraftClient
+import net.minecraft.client.gui.screen.ingame.HandledScreen
 import net.minecraft.item.Item
 import net.minecraft.item.Items
 import net.minecraft.screen.GenericContainerScreenHandler
@@ -366,7 +367,7 @@ object InventoryManager {
      */
     fun findMelonSlotInMenu(): Int {
         val screen = client.currentScreen
-        if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+        if (screen !is HandledScreen<*>) {
             logger.warn("Aucun menu ouvert pour chercher le melon")
             return -1
         }
@@ -399,7 +400,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour chercher un slot vide")
                 future.complete(-1)
                 return@execute
@@ -449,7 +450,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour chercher les seaux")
                 future.complete(null)
                 return@execute
@@ -499,7 +500,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(0)
                 return@execute
             }
@@ -548,7 +549,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour chercher les seaux")
                 future.complete(emptyList())
                 return@execute
@@ -602,7 +603,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 logger.warn("Aucun menu ouvert pour chercher les seaux dans le coffre")
                 future.complete(emptyList())
                 return@execute
@@ -651,7 +652,7 @@ object InventoryManager {
      */
     fun findIronBarsSlotInMenu(): Int {
         val screen = client.currentScreen
-        if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+        if (screen !is HandledScreen<*>) {
             logger.warn("Aucun menu ouvert pour chercher les barreaux de fer")
             return -1
         }
@@ -724,7 +725,7 @@ object InventoryManager {
      */
     fun findNetheriteAxeSlotInMenu(): Int {
         val screen = client.currentScreen
-        if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+        if (screen !is HandledScreen<*>) {
             logger.warn("Aucun menu ouvert pour chercher la hache en netherite")
             return -1
         }
@@ -757,7 +758,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(-1)
                 return@execute
             }
@@ -806,7 +807,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(true)
                 return@execute
             }
@@ -843,7 +844,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(-1)
                 return@execute
             }
@@ -893,7 +894,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(-1)
                 return@execute
             }
@@ -1057,7 +1058,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(-1)
                 return@execute
             }
@@ -1107,7 +1108,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(-1)
                 return@execute
             }
@@ -1161,7 +1162,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(-1)
                 return@execute
             }
@@ -1221,7 +1222,7 @@ object InventoryManager {
 
         client.execute {
             val screen = client.currentScreen
-            if (screen !is net.minecraft.client.gui.screen.ingame.HandledScreen<*>) {
+            if (screen !is HandledScreen<*>) {
                 future.complete(0)
                 return@execute
             }
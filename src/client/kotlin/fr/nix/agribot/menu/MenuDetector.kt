@@ -1,5 +1,6 @@
 package fr.nix.agribot.menu
 
+import net.fabricmc.fabric.api.client.screen.v1.ScreenEvents
 import net.minecraft.client.MinecraftClient
 import net.minecraft.client.gui.screen.Screen
 import net.minecraft.client.gui.screen.ingame.GenericContainerScreen
@@ -7,6 +8,9 @@ import net.minecraft.client.gui.screen.ingame.HandledScreen
 import net.minecraft.screen.GenericContainerScreenHandler
 import net.minecraft.screen.ScreenHandler
 import org.slf4j.LoggerFactory
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.locks.ReentrantLock
+import kotlin.concurrent.withLock
 
 /**
  * Gestionnaire de detection de menus pour le bot.
@@ -25,6 +29,41 @@ object MenuDetector {
     private var cachedScreen: Screen? = null
     private var globalTickCounter: Long = 0
 
+    // === SIGNAL D'OUVERTURE D'ECRAN ===
+    // Les attentes de menu (threads de test/actions) dorment jusqu'a l'initialisation
+    // d'un ecran au lieu de reverifier client.currentScreen toutes les 50ms
+    private val screenChangeLock = ReentrantLock()
+    private val screenChanged = screenChangeLock.newCondition()
+    @Volatile
+    private var screenChangeCount: Long = 0
+
+    /**
+     * Enregistre l'evenement qui reveille les attentes de menu a chaque ecran initialise.
+     * Appele une fois au demarrage du client.
+     */
+    fun init() {
+        ScreenEvents.AFTER_INIT.register { _, _, _, _ ->
+            screenChangeLock.withLock {
+                screenChangeCount++
+                screenChanged.signalAll()
+            }
+        }
+    }
+
+    /**
+     * Attend le prochain ecran initialise, au plus maxWaitMs.
+     * @param seenCount Valeur de screenChangeCount lue avant la derniere verification:
+     *                  si un ecran s'est ouvert entre-temps, on ne dort pas
+     */
+    private fun awaitScreenChange(seenCount: Long, maxWaitMs: Long) {
+        if (maxWaitMs <= 0) return
+        screenChangeLock.withLock {
+            if (screenChangeCount == seenCount) {
+                screenChanged.await(maxWaitMs, TimeUnit.MILLISECONDS)
+            }
+        }
+    }
+
     /**
      * Doit etre appele une fois par tick pour permettre l'invalidation du cache.
      * Appele automatiquement par BotCore via InventoryManager.
@@ -181,18 +220,20 @@ object MenuDetector {
      * Attend qu'un menu soit ouvert.
      *
      * @param timeoutMs Temps maximum d'attente en millisecondes
-     * @param checkIntervalMs Intervalle entre chaque verification en millisecondes
+     * @param checkIntervalMs Intervalle max entre deux verifications en millisecondes (reveil immediat a l'ouverture d'un ecran)
      * @param stabilizationDelayMs Delai supplementaire apres detection pour s'assurer que le menu est charge (default: 2000ms)
      * @return true si un menu s'est ouvert, false si timeout
      */
     fun waitForMenuOpen(
         timeoutMs: Long = 5000,
-        checkIntervalMs: Long = 50,
+        checkIntervalMs: Long = 250,
         stabilizationDelayMs: Long = 2000
     ): Boolean {
-        val startTime = System.currentTimeMillis()
+        // Horloge monotone: un ajustement de l'heure systeme (NTP) ne fausse pas le timeout
+        val deadline = System.nanoTime() + TimeUnit.MILLISECONDS.toNanos(timeoutMs)
 
-        while (System.currentTimeMillis() - startTime < timeoutMs) {
+        while (System.nanoTime() - deadline < 0) {
+            val seenCount = screenChangeCount
             if (isMenuOpen()) {
                 val menuType = detectMenuType()
                 logger.debug("Menu detecte: $menuType")
@@ -213,7 +254,7 @@ object MenuDetector {
                     return true
                 }
             }
-            Thread.sleep(checkIntervalMs)
+            awaitScreenChange(seenCount, minOf(checkIntervalMs, TimeUnit.NANOSECONDS.toMillis(deadline - System.nanoTime())))
         }
 
         logger.warn("Timeout: aucun menu detecte apres ${timeoutMs}ms")
@@ -224,18 +265,19 @@ object MenuDetector {
      * Attend qu'un coffre ou container soit ouvert.
      *
      * @param timeoutMs Temps maximum d'attente en millisecondes
-     * @param checkIntervalMs Intervalle entre chaque verification en millisecondes
+     * @param checkIntervalMs Intervalle max entre deux verifications en millisecondes (reveil immediat a l'ouverture d'un ecran)
      * @param stabilizationDelayMs Delai supplementaire apres detection pour s'assurer que le menu est charge (default: 2000ms)
      * @return true si un coffre s'est ouvert, false si timeout
      */
     fun waitForChestOpen(
         timeoutMs: Long = 5000,
-        checkIntervalMs: Long = 50,
+        checkIntervalMs: Long = 250,
         stabilizationDelayMs: Long = 2000
     ): Boolean {
-        val startTime = System.currentTimeMillis()
+        val deadline = System.nanoTime() + TimeUnit.MILLISECONDS.toNanos(timeoutMs)
 
-        while (System.currentTimeMillis() - startTime < timeoutMs) {
+        while (System.nanoTime() - deadline < 0) {
+            val seenCount = screenChangeCount
             if (isChestOrContainerOpen()) {
                 logger.debug("Coffre/container detecte")
 
@@ -257,7 +299,7 @@ object MenuDetector {
                     return true
                 }
             }
-            Thread.sleep(checkIntervalMs)
+            awaitScreenChange(seenCount, minOf(checkIntervalMs, TimeUnit.NANOSECONDS.toMillis(deadline - System.nanoTime())))
         }
 
         logger.warn("Timeout: aucun coffre detecte apres ${timeoutMs}ms")
@@ -268,18 +310,19 @@ object MenuDetector {
      * Attend qu'un menu simple soit ouvert.
      *
      * @param timeoutMs Temps maximum d'attente en millisecondes
-     * @param checkIntervalMs Intervalle entre chaque verification en millisecondes
+     * @param checkIntervalMs Intervalle max entre deux verifications en millisecondes (reveil immediat a l'ouverture d'un ecran)
      * @param stabilizationDelayMs Delai supplementaire apres detection pour s'assurer que le menu est charge (default: 2000ms)
      * @return true si un menu simple s'est ouvert, false si timeout
      */
     fun waitForSimpleMenuOpen(
         timeoutMs: Long = 5000,
-        checkIntervalMs: Long = 50,
+        checkIntervalMs: Long = 250,
         stabilizationDelayMs: Long = 2000
     ): Boolean {
-        val startTime = System.currentTimeMillis()
+        val deadline = System.nanoTime() + TimeUnit.MILLISECONDS.toNanos(timeoutMs)
 
-        while (System.currentTimeMillis() - startTime < timeoutMs) {
+        while (System.nanoTime() - deadline < 0) {
+            val seenCount = screenChangeCount
             if (isSimpleMenuOpen()) {
                 logger.debug("Menu simple detecte")
 
@@ -301,7 +344,7 @@ object MenuDetector {
                     return true
                 }
             }
-            Thread.sleep(checkIntervalMs)
+            awaitScreenChange(seenCount, minOf(checkIntervalMs, TimeUnit.NANOSECONDS.toMillis(deadline - System.nanoTime())))
         }
 
         logger.warn("Timeout: aucun menu simple detecte apres ${timeoutMs}ms")
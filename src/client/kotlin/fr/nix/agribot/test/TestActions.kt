@@ -201,7 +201,7 @@ object TestActions {
 
     /**
      * Test complet de plantation : TP vers station, recolte si necessaire, puis plante.
-     * Sequence: TP -> Selection graines -> Ouverture station -> Recolte -> Fermeture -> Plantation
+     * Sequence: Selection graines -> TP -> Ouverture station -> Recolte -> Fermeture -> Plantation
      */
     fun testPlanter() {
         thread(name = "test-planter") {
@@ -220,17 +220,17 @@ object TestActions {
                 val stationName = stations[0]
                 logger.info("Station de test: $stationName")
 
-                // Etape 1: TP vers la premiere station
-                logger.info("TP vers station: $stationName")
-                ChatManager.teleportToHome(stationName)
-                Thread.sleep(config.delayAfterTeleport.toLong())
-
-                // Etape 2: Selectionner le slot des graines
+                // Etape 1: Selectionner le slot des graines avant le TP:
+                // la selection se fait pendant l'attente de teleportation au lieu d'ajouter sa propre pause
                 logger.info("Selection slot graines...")
                 if (!InventoryManager.selectSeedsSlotAuto()) {
                     logger.warn("Aucun slot de graines trouve, utilisation du slot actuel")
                 }
-                Thread.sleep(200)
+
+                // Etape 2: TP vers la premiere station
+                logger.info("TP vers station: $stationName")
+                ChatManager.teleportToHome(stationName)
+                Thread.sleep(config.delayAfterTeleport.toLong())
 
                 // Etape 3: Ouvrir la station (clic droit)
                 logger.info("Ouverture station...")